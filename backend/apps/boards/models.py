@@ -252,15 +252,24 @@ class CardButton(models.Model):
         return self.name
     
     def should_show_for_card(self, card: "BoardCard") -> bool:
-        """Check if this button should be displayed for the given card."""
-        if self.show_when_has_label:
-            if not card.label_assignments.filter(label=self.show_when_has_label).exists():
+        """Check if this button should be displayed for the given card.
+
+        Iterates ``card.label_assignments.all()`` so a prefetched
+        ``label_assignments`` cache is used instead of a query per call.
+        """
+        if not self.show_when_has_label_id and not self.hide_when_has_label_id:
+            return True
+
+        label_ids = {assignment.label_id for assignment in card.label_assignments.all()}
+
+        if self.show_when_has_label_id:
+            if self.show_when_has_label_id not in label_ids:
                 return False
-        
-        if self.hide_when_has_label:
-            if card.label_assignments.filter(label=self.hide_when_has_label).exists():
+
+        if self.hide_when_has_label_id:
+            if self.hide_when_has_label_id in label_ids:
                 return False
-        
+
         return True
 
 
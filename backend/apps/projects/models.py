@@ -459,7 +459,11 @@ class TaskButton(models.Model):
         return self.name
     
     def should_show_for_task(self, task: Task) -> bool:
-        """Check if this button should be displayed for the given task."""
+        """Check if this button should be displayed for the given task.
+
+        Iterates ``task.label_assignments.all()`` so a prefetched
+        ``label_assignments`` cache is used instead of a query per call.
+        """
         # Check status condition
         if self.show_on_status and task.status not in self.show_on_status:
             return False
@@ -468,14 +472,19 @@ class TaskButton(models.Model):
         if self.show_on_priority and task.priority not in self.show_on_priority:
             return False
         
+        if not self.show_when_has_label_id and not self.hide_when_has_label_id:
+            return True
+        
+        label_ids = {assignment.label_id for assignment in task.label_assignments.all()}
+        
         # Check required label
-        if self.show_when_has_label:
-            if not task.label_assignments.filter(label=self.show_when_has_label).exists():
+        if self.show_when_has_label_id:
+            if self.show_when_has_label_id not in label_ids:
                 return False
         
         # Check hidden label
-        if self.hide_when_has_label:
-            if task.label_assignments.filter(label=self.hide_when_has_label).exists():
+        if self.hide_when_has_label_id:
+            if self.hide_when_has_label_id in label_ids:
                 return False
         
         return True
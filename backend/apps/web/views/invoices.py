@@ -292,8 +292,6 @@ def invoices_pdf(request, invoice_id):
         raise Http404() from exc
 
     try:
-        from django.template.loader import render_to_string
-
         template_override = (request.GET.get("template") or "").strip()
         if template_override in {choice for choice, _label in Invoice.PdfTemplate.choices}:
             invoice.pdf_template = template_override
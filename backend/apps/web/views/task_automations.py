@@ -407,6 +407,9 @@ def task_button_execute(request, task_id, button_id):
         .prefetch_related("actions", "show_when_has_label", "hide_when_has_label")
     )
 
+    # refresh_from_db() drops prefetches; should_show_for_task() and the card
+    # both read the task's label assignments, so load them once here.
+    models.prefetch_related_objects([task], "label_assignments__label")
     task.filtered_buttons = [btn for btn in all_buttons if btn.should_show_for_task(task)]
 
     return render(
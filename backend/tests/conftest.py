@@ -4,6 +4,8 @@ Pytest configuration and shared fixtures.
 
 import os
 import sys
+import types
+from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
@@ -22,6 +24,30 @@ import django
 django.setup()
 
 
+def pytest_configure(config):
+    """Use a fast password hasher for the whole test run."""
+    # Every user_factory() call hashes a password; PBKDF2's iterations dominate
+    # user creation, and the tests never depend on the hash strength.
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class _FakeWeasyHTML:
+    """Stand-in for weasyprint.HTML; PDF views only need write_pdf()."""
+
+    def __init__(self, string, base_url):
+        self.string = string
+        self.base_url = base_url
+
+    def write_pdf(self):
+        return b"%PDF-TEST"
+
+
+# Keep the real weasyprint (cairo/pango bindings) from ever being imported in tests
+_fake_weasyprint = types.ModuleType("weasyprint")
+_fake_weasyprint.HTML = _FakeWeasyHTML  # type: ignore[attr-defined]
+sys.modules.setdefault("weasyprint", _fake_weasyprint)
+
+
 @pytest.fixture
 def client():
     """Django test client."""
@@ -63,7 +89,8 @@ def organization_factory(db, user_factory):
 
     def create_organization(name="Test Org", slug=None, user=None):
         if user is None:
-            user = user_factory()
+            # Owners are never logged in with a password; skip hashing one.
+            user = user_factory(password=None)
         if slug is None:
             slug = f"test-org-{uuid.uuid4().hex[:8]}"
 
@@ -126,10 +153,10 @@ def project_factory(db, organization_factory, user_factory):
     from datetime import datetime
 
     def create_project(organization=None, created_by=None, **kwargs):
-        if organization is None:
-            organization = organization_factory()
         if created_by is None:
             created_by = user_factory()
+        if organization is None:
+            organization = organization_factory(user=created_by)
 
         defaults = {
             "title": "Test Project",
@@ -196,6 +223,35 @@ def task_factory(db, project_factory, user_factory):
     return create_task
 
 
+@pytest.fixture
+def project_with_tasks_factory(db):
+    """Factory that inserts a project and its tasks with one bulk_create each.
+
+    ``bulk_create`` skips ``save()`` and ``post_save``, so the recurring-task
+    signal does not run for these tasks; use ``task_factory`` when it should.
+    """
+    from apps.projects.models import Project, Task
+    from django.utils import timezone
+    from datetime import timedelta
+
+    def create_project_with_tasks(organization, created_by, task_specs=(), **kwargs):
+        now = timezone.now()
+        defaults = {
+            "title": "Test Project",
+            "start_date": now,
+            "end_date": now + timedelta(days=30),
+        }
+        defaults.update(kwargs)
+
+        (project,) = Project.objects.bulk_create([
+            Project(organization=organization, created_by=created_by, **defaults)
+        ])
+        tasks = Task.objects.bulk_create([Task(project=project, **spec) for spec in task_specs])
+        return project, tasks
+
+    return create_project_with_tasks
+
+
 @pytest.fixture
 def recurring_task_factory(db):
     """Factory for creating test recurring tasks linked to existing tasks."""
@@ -252,10 +308,10 @@ def automation_rule_factory(db, organization_factory, user_factory):
         trigger_type=TaskAutomationRule.TriggerType.TASK_CREATED,
         **kwargs
     ):
-        if organization is None:
-            organization = organization_factory()
         if created_by is None:
             created_by = user_factory()
+        if organization is None:
+            organization = organization_factory(user=created_by)
         
         defaults = {
             "name": "Test Rule",
@@ -274,10 +330,18 @@ def automation_rule_factory(db, organization_factory, user_factory):
 
 
 @pytest.fixture
-def authenticated_client(client, user_factory):
+def auth_user(user_factory):
+    """User that ``authenticated_client`` is logged in as.
+
+    Created with an unusable password since ``force_login`` never checks it.
+    """
+    return user_factory(password=None)
+
+
+@pytest.fixture
+def authenticated_client(client, auth_user):
     """Authenticated Django test client."""
-    user = user_factory()
-    client.force_login(user)
+    client.force_login(auth_user)
     return client
 
 
@@ -300,14 +364,46 @@ def authenticated_api_client_with_org(api_client, user_factory, organization_fac
 
 
 @pytest.fixture
-def active_organization(authenticated_client, organization_factory):
-    """Client with active organization set."""
-    org = organization_factory()
-    # Simulate setting active organization in session
-    authenticated_client.session["active_org_id"] = str(org.id)
+def active_organization(authenticated_client, auth_user, organization_factory):
+    """Organization owned by the logged-in user and stored as the session's active org."""
+    org = organization_factory(user=auth_user)
+    session = authenticated_client.session
+    session["active_org_id"] = str(org.id)
+    session.save()
     return org
 
 
+@pytest.fixture
+def workflow_ctx(client, user_factory, organization_factory):
+    """Logged-in client whose user owns the active organization."""
+    from types import SimpleNamespace
+
+    user = user_factory()
+    org = organization_factory(user=user)
+    client.force_login(user)
+    session = client.session
+    session["active_org_id"] = str(org.id)
+    session.save()
+    return SimpleNamespace(org=org, user=user, client=client)
+
+
+@pytest.fixture
+def pdf_mocks(mocker):
+    """Stub template rendering for PDF views; returns the render mock.
+
+    weasyprint itself is replaced module-wide by ``_FakeWeasyHTML`` above.
+    """
+    return mocker.patch("apps.web.views.invoices.render_to_string", return_value="<html></html>")
+
+
+@pytest.fixture
+def frozen_now(mocker):
+    """Pin ``django.utils.timezone.now()`` to a fixed instant and return it."""
+    now = datetime(2024, 1, 15, 12, 0, tzinfo=UTC)
+    mocker.patch("django.utils.timezone.now", return_value=now)
+    return now
+
+
 @pytest.fixture
 def mock_ai_provider():
     """Mock AI provider for testing."""
@@ -0,0 +1,13 @@
+"""
+Shared helpers for the model test modules.
+"""
+
+
+def choice_id(choice):
+    """Use the enum member name as the parametrize id."""
+    return choice.name
+
+
+def clean_field(instance, field_name):
+    """Run a single field's validation on an unsaved instance, without the database."""
+    return instance._meta.get_field(field_name).clean(getattr(instance, field_name), instance)
@@ -3,6 +3,7 @@ Tests for boards app models (Board, BoardColumn, BoardCard, etc.).
 """
 
 import pytest
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -13,52 +14,49 @@ from apps.boards.models import (
 )
 
 
+@pytest.fixture
+def board_ctx(db, organization_factory, user_factory):
+    """Create the org, user and board shared by the board model tests."""
+    user = user_factory()
+    org = organization_factory(user=user)
+    board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+    return {
+        "org": org,
+        "user": user,
+        "board": board,
+    }
+
+
 class TestBoard:
     """Test cases for Board model."""
 
     def test_create_board(self, organization_factory, user_factory):
         """Test creating a basic board."""
-        org = organization_factory()
         user = user_factory()
+        org = organization_factory(user=user)
 
-        board = Board.objects.create(
-            organization=org,
-            title="Test Board",
-            created_by=user
-        )
+        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        board.refresh_from_db()
 
         assert board.title == "Test Board"
         assert board.organization == org
         assert board.created_by == user
         assert str(board) == "Test Board"
 
-    def test_board_str_representation(self, organization_factory, user_factory):
+    def test_board_str_representation(self):
         """Test string representation of board."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(
-            organization=org,
-            title="Kanban Board",
-            created_by=user
-        )
+        board = Board(title="Kanban Board")
 
         assert str(board) == "Kanban Board"
 
 
+@pytest.mark.django_db
 class TestBoardColumn:
     """Test cases for BoardColumn model."""
 
-    def test_create_board_column(self, organization_factory, user_factory):
+    def test_create_board_column(self, board_ctx):
         """Test creating a board column."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(
-            organization=org,
-            title="Test Board",
-            created_by=user
-        )
+        board = board_ctx["board"]
 
         column = BoardColumn.objects.create(
             board=board,
@@ -71,40 +69,26 @@ class TestBoardColumn:
         assert column.sort_order == 1
         assert str(column) == f"{board.title}: {column.title}"
 
-    def test_column_ordering(self, organization_factory, user_factory):
+    def test_column_ordering(self, board_ctx, django_assert_num_queries):
         """Test that columns are ordered by sort_order."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(
-            organization=org,
-            title="Test Board",
-            created_by=user
-        )
+        board = board_ctx["board"]
 
         col1 = BoardColumn.objects.create(board=board, title="Col 1", sort_order=2)
         col2 = BoardColumn.objects.create(board=board, title="Col 2", sort_order=1)
         col3 = BoardColumn.objects.create(board=board, title="Col 3", sort_order=3)
 
-        columns = list(BoardColumn.objects.filter(board=board))
-        assert columns[0] == col2  # sort_order=1
-        assert columns[1] == col1  # sort_order=2
-        assert columns[2] == col3  # sort_order=3
+        with django_assert_num_queries(1):
+            columns = list(BoardColumn.objects.filter(board=board).order_by("sort_order"))
+            assert columns == [col2, col1, col3]
 
 
+@pytest.mark.django_db
 class TestBoardCard:
     """Test cases for BoardCard model."""
 
-    def test_create_board_card(self, organization_factory, user_factory):
+    def test_create_board_card(self, board_ctx):
         """Test creating a board card."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(
-            organization=org,
-            title="Test Board",
-            created_by=user
-        )
+        user, board = board_ctx["user"], board_ctx["board"]
 
         column = BoardColumn.objects.create(
             board=board,
@@ -126,33 +110,27 @@ class TestBoardCard:
         assert card.sort_order == 0
         assert str(card) == "Test Card"
 
-    def test_card_ordering(self, organization_factory, user_factory):
+    def test_card_ordering(self, board_ctx, django_assert_num_queries):
         """Test that cards are ordered by sort_order."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        user, board = board_ctx["user"], board_ctx["board"]
         column = BoardColumn.objects.create(board=board, title="To Do", sort_order=1)
 
         card1 = BoardCard.objects.create(column=column, title="Card 1", sort_order=2, created_by=user)
         card2 = BoardCard.objects.create(column=column, title="Card 2", sort_order=1, created_by=user)
         card3 = BoardCard.objects.create(column=column, title="Card 3", sort_order=3, created_by=user)
 
-        cards = list(BoardCard.objects.filter(column=column))
-        assert cards[0] == card2  # sort_order=1
-        assert cards[1] == card1  # sort_order=2
-        assert cards[2] == card3  # sort_order=3
+        with django_assert_num_queries(1):
+            cards = list(BoardCard.objects.filter(column=column).order_by("sort_order"))
+            assert cards == [card2, card1, card3]
 
 
+@pytest.mark.django_db
 class TestBoardCardLink:
     """Test cases for BoardCardLink model."""
 
-    def test_create_card_link(self, organization_factory, user_factory):
+    def test_create_card_link(self, board_ctx):
         """Test creating a card link."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        user, board = board_ctx["user"], board_ctx["board"]
         column = BoardColumn.objects.create(board=board, title="To Do", sort_order=1)
         card = BoardCard.objects.create(column=column, title="Test Card", created_by=user)
 
@@ -168,15 +146,13 @@ class TestBoardCardLink:
         assert str(link) == "https://github.com/org/repo/issues/123"
 
 
+@pytest.mark.django_db
 class TestBoardCardLabel:
     """Test cases for BoardCardLabel model."""
 
-    def test_create_card_label(self, organization_factory, user_factory):
+    def test_create_card_label(self, board_ctx):
         """Test creating a card label."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        board = board_ctx["board"]
 
         label = BoardCardLabel.objects.create(
             board=board,
@@ -189,33 +165,29 @@ class TestBoardCardLabel:
         assert label.color == "red"
         assert str(label) == "Bug"
 
-    def test_label_unique_per_board(self, organization_factory, user_factory):
+    def test_label_unique_per_board(self, board_ctx):
         """Test that labels must be unique per board."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        org, user, board = board_ctx["org"], board_ctx["user"], board_ctx["board"]
 
         BoardCardLabel.objects.create(board=board, name="Duplicate", color="blue")
 
-        # Creating duplicate should fail
-        with pytest.raises(Exception):  # IntegrityError
-            BoardCardLabel.objects.create(board=board, name="Duplicate", color="red")
+        # Creating duplicate should fail; the savepoint keeps the outer transaction usable
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                BoardCardLabel.objects.create(board=board, name="Duplicate", color="red")
 
         # But different board can have same name
         board2 = Board.objects.create(organization=org, title="Board 2", created_by=user)
         BoardCardLabel.objects.create(board=board2, name="Duplicate", color="green")  # Should not raise
 
 
+@pytest.mark.django_db
 class TestAutomationRule:
     """Test cases for AutomationRule model."""
 
-    def test_create_automation_rule(self, organization_factory, user_factory):
+    def test_create_automation_rule(self, board_ctx):
         """Test creating an automation rule."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        user, board = board_ctx["user"], board_ctx["board"]
 
         rule = AutomationRule.objects.create(
             board=board,
@@ -232,16 +204,20 @@ class TestAutomationRule:
         assert rule.is_active is True
         assert str(rule) == "Auto-move completed cards (Card Moved)"
 
-    def test_rule_ordering(self, organization_factory, user_factory):
+    def test_rule_ordering(self, board_ctx):
         """Test that rules are ordered by created_at desc."""
-        org = organization_factory()
-        user = user_factory()
+        user, board = board_ctx["user"], board_ctx["board"]
 
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        rule1, rule2, rule3 = AutomationRule.objects.bulk_create([
+            AutomationRule(board=board, name=f"Rule {i}", trigger_type=AutomationRule.TriggerType.CARD_CREATED, created_by=user)
+            for i in range(1, 4)
+        ])
 
-        rule1 = AutomationRule.objects.create(board=board, name="Rule 1", trigger_type=AutomationRule.TriggerType.CARD_CREATED, created_by=user)
-        rule2 = AutomationRule.objects.create(board=board, name="Rule 2", trigger_type=AutomationRule.TriggerType.CARD_CREATED, created_by=user)
-        rule3 = AutomationRule.objects.create(board=board, name="Rule 3", trigger_type=AutomationRule.TriggerType.CARD_CREATED, created_by=user)
+        # created_at is auto_now_add, so pin explicit timestamps for a deterministic order
+        now = timezone.now()
+        AutomationRule.objects.filter(pk=rule1.pk).update(created_at=now - timedelta(seconds=2))
+        AutomationRule.objects.filter(pk=rule2.pk).update(created_at=now - timedelta(seconds=1))
+        AutomationRule.objects.filter(pk=rule3.pk).update(created_at=now)
 
         rules = list(AutomationRule.objects.filter(board=board))
         assert rules[0] == rule3  # Most recent first
@@ -249,15 +225,13 @@ class TestAutomationRule:
         assert rules[2] == rule1
 
 
+@pytest.mark.django_db
 class TestCardButton:
     """Test cases for CardButton model."""
 
-    def test_create_card_button(self, organization_factory, user_factory):
+    def test_create_card_button(self, board_ctx):
         """Test creating a card button."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        user, board = board_ctx["user"], board_ctx["board"]
 
         button = CardButton.objects.create(
             board=board,
@@ -275,12 +249,9 @@ class TestCardButton:
         assert button.is_active is True
         assert str(button) == "Mark as Urgent"
 
-    def test_button_should_show_for_card(self, organization_factory, user_factory):
+    def test_button_should_show_for_card(self, board_ctx, django_assert_num_queries):
         """Test the should_show_for_card method."""
-        org = organization_factory()
-        user = user_factory()
-
-        board = Board.objects.create(organization=org, title="Test Board", created_by=user)
+        user, board = board_ctx["user"], board_ctx["board"]
         column = BoardColumn.objects.create(board=board, title="To Do", sort_order=1)
         card = BoardCard.objects.create(column=column, title="Test Card", created_by=user)
 
@@ -298,9 +269,11 @@ class TestCardButton:
         # Should not show without label
         assert label_button.should_show_for_card(card) is False
 
-        # Add label to card
+        # Add label to card; with prefetched assignments the check is query-free
         BoardCardLabelAssignment.objects.create(card=card, label=label)
-        assert label_button.should_show_for_card(card) is True
+        card = BoardCard.objects.prefetch_related("label_assignments__label").get(pk=card.pk)
+        with django_assert_num_queries(0):
+            assert label_button.should_show_for_card(card) is True
 
         # Button with hidden label
         hidden_button = CardButton.objects.create(
@@ -315,3 +288,7 @@ class TestCardButton:
         assert hidden_button.should_show_for_card(card2) is True
 
         # Should not show with label
+        BoardCardLabelAssignment.objects.create(card=card2, label=label)
+        card2 = BoardCard.objects.prefetch_related("label_assignments__label").get(pk=card2.pk)
+        with django_assert_num_queries(0):
+            assert hidden_button.should_show_for_card(card2) is False
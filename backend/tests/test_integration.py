@@ -3,27 +3,22 @@ Integration tests for key application workflows.
 """
 
 import pytest
+from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 
 from apps.projects.models import Project, Task, TaskAutomationRule, TaskAutomationAction
 from apps.tenants.models import Organization, Membership
+from apps.web.views.tasks import tasks_timer
 
 
 class TestProjectTaskWorkflow:
     """Integration tests for project and task management workflow."""
 
-    def test_complete_project_task_workflow(self, authenticated_client, organization_factory, user_factory):
+    def test_complete_project_task_workflow(self, mocker, workflow_ctx):
         """Test the complete workflow of creating a project, adding tasks, and managing them."""
-        # Setup
-        org = organization_factory()
-        user = user_factory()
-        Membership.objects.create(organization=org, user=user, role=Membership.Role.OWNER)
-
-        # Set active organization
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
+        org, user, authenticated_client = workflow_ctx.org, workflow_ctx.user, workflow_ctx.client
 
         # 1. Create a project
         project_data = {
@@ -46,11 +41,8 @@ class TestProjectTaskWorkflow:
 
         # 2. Create tasks for the project
         task_data = {
-            "project": str(project.id),
+            "project_id": str(project.id),
             "title": "First Task",
-            "description": "This is the first task",
-            "status": "TODO",
-            "priority": "HIGH",
             "assigned_to": str(user.id)
         }
 
@@ -63,72 +55,62 @@ class TestProjectTaskWorkflow:
         assert task.assigned_to == user
         assert task.status == Task.Status.TODO
 
-        # 3. Update task status
+        # 3. Move the task to the in-progress column
         update_data = {
             "status": "IN_PROGRESS"
         }
 
         response = authenticated_client.post(
-            reverse("web:tasks_toggle", kwargs={"task_id": task.id}),
+            reverse("web:tasks_move", kwargs={"task_id": task.id}),
             update_data
         )
-        assert response.status_code == 302
+        assert response.status_code == 200
 
         # Verify status changed
         task.refresh_from_db()
         assert task.status == Task.Status.IN_PROGRESS
 
-        # 4. Add time tracking
-        timer_data = {
-            "action": "start"
-        }
-
-        response = authenticated_client.post(
-            reverse("web:tasks_timer", kwargs={"task_id": task.id}),
-            timer_data
-        )
+        # 4. Add time tracking (clock is pinned so no real waiting is needed).
+        # The steps above cover the full middleware stack; the timer view is
+        # called directly with what ActiveOrganizationMiddleware would set.
+        started_at = timezone.now()
+        clock = mocker.patch("apps.web.views.tasks.timezone.now", return_value=started_at)
+        factory = RequestFactory()
+
+        request = factory.post("/", {"action": "start"})
+        request.user = user
+        request.active_org = org
+        response = tasks_timer(request, task_id=task.id)
         assert response.status_code == 302
 
-        # Stop timer after some time
-        import time
-        time.sleep(0.1)  # Small delay
+        # Stop timer one minute later
+        clock.return_value = started_at + timedelta(minutes=1)
 
-        timer_data = {
-            "action": "stop"
-        }
-
-        response = authenticated_client.post(
-            reverse("web:tasks_timer", kwargs={"task_id": task.id}),
-            timer_data
-        )
+        request = factory.post("/", {"action": "stop"})
+        request.user = user
+        request.active_org = org
+        response = tasks_timer(request, task_id=task.id)
         assert response.status_code == 302
 
         # Verify time was tracked
         task.refresh_from_db()
-        assert task.tracked_seconds > 0
+        assert task.tracked_seconds >= 60
 
 
 class TestAutomationWorkflow:
     """Integration tests for automation workflows."""
 
-    def test_task_automation_workflow(self, authenticated_client, organization_factory, user_factory, project_factory, task_factory):
+    def test_task_automation_workflow(self, workflow_ctx, project_factory, task_factory):
         """Test the complete automation workflow."""
-        # Setup
-        org = organization_factory()
-        user = user_factory()
+        org, user, authenticated_client = workflow_ctx.org, workflow_ctx.user, workflow_ctx.client
         project = project_factory(organization=org, created_by=user)
-        Membership.objects.create(organization=org, user=user, role=Membership.Role.OWNER)
-
-        # Set active organization
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
 
         # 1. Create an automation rule
         rule_data = {
             "name": "Auto-complete high priority tasks",
             "trigger_type": "status_changed",
-            "trigger_config": '{"to_status": "DONE"}',
-            "description": "Automatically archive completed tasks"
+            "to_status": "DONE",
+            "action_type_0": "archive_task",
         }
 
         response = authenticated_client.post(reverse("web:task_automation_rule_create"), rule_data)
@@ -139,27 +121,17 @@ class TestAutomationWorkflow:
         assert rule.organization == org
         assert rule.trigger_type == TaskAutomationRule.TriggerType.STATUS_CHANGED
         assert rule.is_active is True
+        assert rule.trigger_config == {"to_status": "DONE"}
 
-        # 2. Add automation action
-        action_data = {
-            "rule": str(rule.id),
-            "action_type": "archive_task",
-            "action_config": "{}"
-        }
-
-        # Since we don't have a direct endpoint, create via model
-        action = TaskAutomationAction.objects.create(
-            rule=rule,
-            action_type=TaskAutomationAction.ActionType.ARCHIVE_TASK,
-            action_config={}
-        )
+        # 2. The action posted alongside the rule
+        action = rule.actions.get()
+        assert action.action_type == TaskAutomationAction.ActionType.ARCHIVE_TASK
 
-        # 3. Create a task and trigger automation
+        # 3. Create a task and complete it through the web view (triggers automation)
         task = task_factory(project=project, assigned_to=user, status=Task.Status.IN_PROGRESS)
 
-        # Change task status to DONE (should trigger automation)
-        task.status = Task.Status.DONE
-        task.save()
+        response = authenticated_client.post(reverse("web:tasks_toggle", kwargs={"task_id": task.id}))
+        assert response.status_code == 302
 
         # Check if automation ran (task should be archived)
         task.refresh_from_db()
@@ -170,16 +142,9 @@ class TestAutomationWorkflow:
 class TestTeamCollaborationWorkflow:
     """Integration tests for team collaboration features."""
 
-    def test_team_invitation_workflow(self, authenticated_client, organization_factory, user_factory):
+    def test_team_invitation_workflow(self, workflow_ctx, user_factory):
         """Test the team invitation and acceptance workflow."""
-        # Setup
-        org = organization_factory()
-        owner = user_factory()
-        Membership.objects.create(organization=org, user=owner, role=Membership.Role.OWNER)
-
-        # Set active organization
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
+        org, owner, authenticated_client = workflow_ctx.org, workflow_ctx.user, workflow_ctx.client
 
         # 1. Send team invitation
         invite_data = {
@@ -201,8 +166,9 @@ class TestTeamCollaborationWorkflow:
         from django.test import Client
         new_client = Client()
 
-        # Create the invited user
+        # Create the invited user and sign them in
         invited_user = user_factory(email="newmember@example.com")
+        new_client.force_login(invited_user)
 
         # Accept invitation
         accept_data = {
@@ -224,17 +190,10 @@ class TestTeamCollaborationWorkflow:
 class TestCalendarWorkflow:
     """Integration tests for calendar functionality."""
 
-    def test_calendar_event_workflow(self, authenticated_client, organization_factory, user_factory, project_factory, task_factory):
+    def test_calendar_event_workflow(self, workflow_ctx, project_factory, task_factory, django_assert_max_num_queries):
         """Test calendar event creation and filtering."""
-        # Setup
-        org = organization_factory()
-        user = user_factory()
+        org, user, authenticated_client = workflow_ctx.org, workflow_ctx.user, workflow_ctx.client
         project = project_factory(organization=org, created_by=user)
-        Membership.objects.create(organization=org, user=user, role=Membership.Role.OWNER)
-
-        # Set active organization
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
 
         # 1. Create scheduled tasks
         now = timezone.now()
@@ -254,7 +213,10 @@ class TestCalendarWorkflow:
         )
 
         # 2. Request calendar events
-        response = authenticated_client.get(reverse("web:calendar_events"))
+        # session, user, active org + membership, tasks (project/assignee
+        # joined via select_related) and project spans -- no per-task queries
+        with django_assert_max_num_queries(6):
+            response = authenticated_client.get(reverse("web:calendar_events"))
         assert response.status_code == 200
 
         events = response.json()
@@ -269,18 +231,18 @@ class TestCalendarWorkflow:
 
         # 3. Test filtering by project
         response = authenticated_client.get(
-            reverse("web:calendar_events") + f"?project={project.id}"
+            reverse("web:calendar_events"), {"project": str(project.id)}
         )
         events = response.json()
         assert len(events) >= 1  # At least the scheduled task
 
         # 4. Test date range filtering
-        start_date = (now + timedelta(days=2)).isoformat()
-        end_date = (now + timedelta(days=10)).isoformat()
+        params = {
+            "start": (now + timedelta(days=2)).isoformat(),
+            "end": (now + timedelta(days=10)).isoformat(),
+        }
 
-        response = authenticated_client.get(
-            reverse("web:calendar_events") + f"?start={start_date}&end={end_date}"
-        )
+        response = authenticated_client.get(reverse("web:calendar_events"), params)
         events = response.json()
 
         # Should not include our scheduled task (which is tomorrow)
@@ -3,6 +3,8 @@ Tests for project models (Project, Task, TaskTimeEntry, etc.).
 """
 
 import pytest
+from dateutil.relativedelta import relativedelta
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -12,6 +14,17 @@ from apps.projects.models import (
     TaskAutomationLog, TaskButton, TaskButtonAction, Event
 )
 
+from .helpers import choice_id, clean_field
+
+PROJECT_STATUSES = tuple(Project.Status)
+PROJECT_CATEGORIES = tuple(Project.Category)
+PROJECT_PRIORITIES = tuple(Project.Priority)
+PROJECT_COLORS = tuple(Project.Color)
+TASK_STATUSES = tuple(Task.Status)
+TASK_PRIORITIES = tuple(Task.Priority)
+AUTOMATION_TRIGGER_TYPES = tuple(TaskAutomationRule.TriggerType)
+EVENT_TYPES = tuple(Event.Type)
+
 
 class TestProject:
     """Test cases for Project model."""
@@ -27,48 +40,43 @@ class TestProject:
         assert project.color == Project.Color.INDIGO
         assert str(project) == "Test Project"
     
-    def test_project_status_choices(self, project_factory):
+    @pytest.mark.parametrize("status_choice", PROJECT_STATUSES, ids=choice_id)
+    def test_project_status_choices(self, status_choice):
         """Test different project statuses."""
-        for status_choice in Project.Status:
-            project = project_factory(status=status_choice)
-            assert project.status == status_choice
+        project = Project(status=status_choice)
+        assert clean_field(project, "status") == status_choice
     
-    def test_project_category_choices(self, project_factory):
+    @pytest.mark.parametrize("category_choice", PROJECT_CATEGORIES, ids=choice_id)
+    def test_project_category_choices(self, category_choice):
         """Test different project categories."""
-        for category_choice in Project.Category:
-            project = project_factory(category=category_choice)
-            assert project.category == category_choice
+        project = Project(category=category_choice)
+        assert clean_field(project, "category") == category_choice
     
-    def test_project_priority_choices(self, project_factory):
+    @pytest.mark.parametrize("priority_choice", PROJECT_PRIORITIES, ids=choice_id)
+    def test_project_priority_choices(self, priority_choice):
         """Test different project priorities."""
-        for priority_choice in Project.Priority:
-            project = project_factory(priority=priority_choice)
-            assert project.priority == priority_choice
+        project = Project(priority=priority_choice)
+        assert clean_field(project, "priority") == priority_choice
     
-    def test_project_color_choices(self, project_factory):
+    @pytest.mark.parametrize("color_choice", PROJECT_COLORS, ids=choice_id)
+    def test_project_color_choices(self, color_choice):
         """Test different project colors."""
-        for color_choice in Project.Color:
-            project = project_factory(color=color_choice)
-            assert project.color == color_choice
+        project = Project(color=color_choice)
+        assert clean_field(project, "color") == color_choice
     
-    def test_project_end_days_left(self, project_factory):
+    def test_project_end_days_left(self, frozen_now):
         """Test the end_days_left property."""
         # Future project
-        future_project = project_factory(
-            end_date=timezone.now() + timedelta(days=5)
-        )
+        future_project = Project(end_date=frozen_now + timedelta(days=5))
         assert future_project.end_days_left == 5
         
         # Past project
-        past_project = project_factory(
-            end_date=timezone.now() - timedelta(days=3)
-        )
+        past_project = Project(end_date=frozen_now - timedelta(days=3))
         assert past_project.end_days_left == -3
     
-    def test_project_str_representation(self, project_factory):
+    def test_project_str_representation(self):
         """Test string representation of project."""
-        project = project_factory(title="My Awesome Project")
-        assert str(project) == "My Awesome Project"
+        assert str(Project(title="My Awesome Project")) == "My Awesome Project"
 
     def test_project_archive_with_tasks(self, project_factory, task_factory):
         """Test archiving a project with tasks."""
@@ -97,16 +105,17 @@ class TestProject:
         task2 = task_factory(project=project)
 
         # Archive project and tasks
+        now = timezone.now()
         project.is_archived = True
-        project.archived_at = timezone.now()
+        project.archived_at = now
         project.save()
 
         task1.is_archived = True
-        task1.archived_at = timezone.now()
+        task1.archived_at = now
         task1.save()
 
         task2.is_archived = True
-        task2.archived_at = timezone.now()
+        task2.archived_at = now
         task2.save()
 
         # Restore the project (this should restore tasks too in the view logic)
@@ -138,21 +147,21 @@ class TestTask:
         assert task.is_archived is False
         assert str(task) == "Test Task"
     
-    def test_task_status_choices(self, task_factory):
+    @pytest.mark.parametrize("status_choice", TASK_STATUSES, ids=choice_id)
+    def test_task_status_choices(self, status_choice):
         """Test different task statuses."""
-        for status_choice in Task.Status:
-            task = task_factory(status=status_choice)
-            assert task.status == status_choice
+        task = Task(status=status_choice)
+        assert clean_field(task, "status") == status_choice
     
-    def test_task_priority_choices(self, task_factory):
+    @pytest.mark.parametrize("priority_choice", TASK_PRIORITIES, ids=choice_id)
+    def test_task_priority_choices(self, priority_choice):
         """Test different task priorities."""
-        for priority_choice in Task.Priority:
-            task = task_factory(priority=priority_choice)
-            assert task.priority == priority_choice
+        task = Task(priority=priority_choice)
+        assert clean_field(task, "priority") == priority_choice
     
-    def test_task_time_tracking(self, task_factory):
+    def test_task_time_tracking(self):
         """Test task time tracking functionality."""
-        task = task_factory(tracked_seconds=3661)  # 1 hour, 1 minute, 1 second
+        task = Task(tracked_seconds=3661)  # 1 hour, 1 minute, 1 second
         
         assert task.tracked_human == "1h 01m"
         
@@ -160,7 +169,7 @@ class TestTask:
         task.tracked_seconds = 3000  # 50 minutes
         assert task.tracked_human == "50m"
     
-    def test_task_ordering(self, task_factory, project_factory):
+    def test_task_ordering(self, task_factory, project_factory, django_assert_num_queries):
         """Test that tasks are ordered by sort_order."""
         project = project_factory()
         
@@ -168,15 +177,13 @@ class TestTask:
         task2 = task_factory(project=project, sort_order=1)
         task3 = task_factory(project=project, sort_order=3)
         
-        tasks = list(Task.objects.filter(project=project))
-        assert tasks[0] == task2  # sort_order=1
-        assert tasks[1] == task1  # sort_order=2
-        assert tasks[2] == task3  # sort_order=3
+        with django_assert_num_queries(1):
+            pks = list(Task.objects.filter(project=project).values_list("pk", flat=True))
+        assert pks == [task2.pk, task1.pk, task3.pk]
     
-    def test_task_str_representation(self, task_factory):
+    def test_task_str_representation(self):
         """Test string representation of task."""
-        task = task_factory(title="Fix Bug #123")
-        assert str(task) == "Fix Bug #123"
+        assert str(Task(title="Fix Bug #123")) == "Fix Bug #123"
 
 
 class TestRecurringTask:
@@ -213,9 +220,6 @@ class TestRecurringTask:
 
     def test_recurring_task_creation_signal(self, task_factory):
         """Test that completing a recurring task creates a new one."""
-        from django.utils import timezone
-        from dateutil.relativedelta import relativedelta
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1)
@@ -247,8 +251,6 @@ class TestRecurringTask:
 
     def test_recurring_task_with_all_fields(self, task_factory):
         """Test creating recurring task with all fields populated."""
-        from django.utils import timezone
-
         task = task_factory()
         end_date = timezone.now() + timedelta(days=30)
         parent_task = task_factory()
@@ -299,9 +301,6 @@ class TestRecurringTask:
 
     def test_recurring_task_signal_weekly_frequency(self, task_factory):
         """Test recurring task creation with weekly frequency."""
-        from django.utils import timezone
-        from dateutil.relativedelta import relativedelta
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=7)
@@ -327,9 +326,6 @@ class TestRecurringTask:
 
     def test_recurring_task_signal_monthly_frequency(self, task_factory):
         """Test recurring task creation with monthly frequency."""
-        from django.utils import timezone
-        from dateutil.relativedelta import relativedelta
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=30)
@@ -355,9 +351,6 @@ class TestRecurringTask:
 
     def test_recurring_task_signal_with_scheduled_start(self, task_factory):
         """Test recurring task creation using scheduled_start instead of due_date."""
-        from django.utils import timezone
-        from dateutil.relativedelta import relativedelta
-
         task = task_factory(
             status=Task.Status.TODO,
             scheduled_start=timezone.now() + timedelta(days=1)
@@ -405,12 +398,11 @@ class TestRecurringTask:
 
     def test_recurring_task_termination_end_date_reached(self, task_factory):
         """Test that recurring task stops when end_date is reached."""
-        from django.utils import timezone
-
-        past_end_date = timezone.now() - timedelta(days=1)
+        now = timezone.now()
+        past_end_date = now - timedelta(days=1)
         task = task_factory(
             status=Task.Status.TODO,
-            due_date=timezone.now() + timedelta(days=1)
+            due_date=now + timedelta(days=1)
         )
         RecurringTask.objects.create(
             task=task,
@@ -433,8 +425,6 @@ class TestRecurringTask:
 
     def test_recurring_task_termination_max_occurrences_reached(self, task_factory):
         """Test that recurring task stops when max_occurrences is reached."""
-        from django.utils import timezone
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1)
@@ -468,8 +458,6 @@ class TestRecurringTask:
 
     def test_recurring_task_with_recurrence_parent_chain(self, task_factory):
         """Test recurring task with proper parent-child relationships."""
-        from django.utils import timezone
-
         parent_task = task_factory()
         task = task_factory(
             status=Task.Status.TODO,
@@ -500,8 +488,6 @@ class TestRecurringTask:
 
     def test_recurring_task_signal_preserves_task_attributes(self, task_factory):
         """Test that new recurring tasks preserve original task attributes."""
-        from django.utils import timezone
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1),
@@ -535,8 +521,6 @@ class TestRecurringTask:
 
     def test_recurring_task_invalid_frequency_no_creation(self, task_factory):
         """Test that invalid recurrence frequency doesn't create new task."""
-        from django.utils import timezone
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1)
@@ -562,8 +546,6 @@ class TestRecurringTask:
 
     def test_recurring_task_non_recurring_no_signal(self, task_factory):
         """Test that non-recurring tasks don't trigger signal."""
-        from django.utils import timezone
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1)
@@ -588,8 +570,6 @@ class TestRecurringTask:
 
     def test_recurring_task_status_change_not_done_no_signal(self, task_factory):
         """Test that changing status to non-DONE doesn't trigger signal."""
-        from django.utils import timezone
-
         task = task_factory(
             status=Task.Status.TODO,
             due_date=timezone.now() + timedelta(days=1)
@@ -633,33 +613,21 @@ class TestTaskTimeEntry:
         assert time_entry.duration_seconds == 3600
         assert str(time_entry) == f"{task.id} · {user.id} · {time_entry.started_at}"
     
-    def test_time_entry_ordering(self, task_factory, user_factory):
+    def test_time_entry_ordering(self, task_factory, user_factory, django_assert_num_queries):
         """Test that time entries are ordered by started_at desc."""
         task = task_factory()
         user = user_factory()
         
         now = timezone.now()
         
-        entry1 = TaskTimeEntry.objects.create(
-            task=task,
-            user=user,
-            started_at=now - timedelta(hours=2)
-        )
-        entry2 = TaskTimeEntry.objects.create(
-            task=task,
-            user=user,
-            started_at=now - timedelta(hours=1)
-        )
-        entry3 = TaskTimeEntry.objects.create(
-            task=task,
-            user=user,
-            started_at=now
-        )
+        entry1, entry2, entry3 = TaskTimeEntry.objects.bulk_create([
+            TaskTimeEntry(task=task, user=user, started_at=now - timedelta(hours=hours))
+            for hours in (2, 1, 0)
+        ])
         
-        entries = list(TaskTimeEntry.objects.all())
-        assert entries[0] == entry3  # Most recent first
-        assert entries[1] == entry2
-        assert entries[2] == entry1
+        with django_assert_num_queries(1):
+            pks = list(TaskTimeEntry.objects.all().values_list("pk", flat=True))
+        assert pks == [entry3.pk, entry2.pk, entry1.pk]
 
 
 class TestTaskLabel:
@@ -682,8 +650,7 @@ class TestTaskLabel:
     
     def test_label_unique_per_organization(self, db, organization_factory):
         """Test that labels must be unique per organization."""
-        import uuid
-        label_name = f"Test Label {uuid.uuid4().hex[:8]}"
+        label_name = "Test Label"
         org = organization_factory()
 
         TaskLabel.objects.create(
@@ -693,12 +660,13 @@ class TestTaskLabel:
         )
 
         # Creating duplicate should fail
-        with pytest.raises(Exception):  # IntegrityError
-            TaskLabel.objects.create(
-                organization=org,
-                name=label_name,
-                color="red"
-            )
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                TaskLabel.objects.create(
+                    organization=org,
+                    name=label_name,
+                    color="red"
+                )
 
         # But different organization can have same name
         org2 = organization_factory(name="Org 2", slug="org-2")
@@ -712,21 +680,21 @@ class TestTaskLabel:
 class TestTaskLabelAssignment:
     """Test cases for TaskLabelAssignment model."""
     
-    def test_create_label_assignment(self, task_factory, organization_factory):
+    def test_create_label_assignment(self, task_factory, django_assert_num_queries):
         """Test assigning a label to a task."""
-        org = organization_factory()
         task = task_factory()
         
         label = TaskLabel.objects.create(
-            organization=org,
+            organization=task.project.organization,
             name="High Priority",
             color="red"
         )
         
-        assignment = TaskLabelAssignment.objects.create(
-            task=task,
-            label=label
-        )
+        with django_assert_num_queries(1):
+            assignment = TaskLabelAssignment.objects.create(
+                task=task,
+                label=label
+            )
         
         assert assignment.task == task
         assert assignment.label == label
@@ -747,8 +715,9 @@ class TestTaskLabelAssignment:
         TaskLabelAssignment.objects.create(task=task, label=label)
         
         # Second assignment should fail
-        with pytest.raises(Exception):  # IntegrityError
-            TaskLabelAssignment.objects.create(task=task, label=label)
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                TaskLabelAssignment.objects.create(task=task, label=label)
 
 
 class TestTaskAutomationRule:
@@ -766,22 +735,36 @@ class TestTaskAutomationRule:
         assert rule.is_active is True
         assert str(rule) == "Auto-assign new tasks (Task Created)"
     
-    def test_automation_trigger_types(self, automation_rule_factory):
+    @pytest.mark.parametrize("trigger_choice", AUTOMATION_TRIGGER_TYPES, ids=choice_id)
+    def test_automation_trigger_types(self, trigger_choice):
         """Test different automation trigger types."""
-        for trigger_choice in TaskAutomationRule.TriggerType:
-            rule = automation_rule_factory(trigger_type=trigger_choice)
-            assert rule.trigger_type == trigger_choice
+        rule = TaskAutomationRule(trigger_type=trigger_choice)
+        assert clean_field(rule, "trigger_type") == trigger_choice
     
-    def test_rule_ordering(self, automation_rule_factory):
+    def test_rule_ordering(self, organization_factory, user_factory, django_assert_num_queries):
         """Test that rules are ordered by created_at desc."""
-        rule1 = automation_rule_factory()
-        rule2 = automation_rule_factory()
-        rule3 = automation_rule_factory()
+        user = user_factory()
+        org = organization_factory(user=user)
         
-        rules = list(TaskAutomationRule.objects.all())
-        assert rules[0] == rule3  # Most recent first
-        assert rules[1] == rule2
-        assert rules[2] == rule1
+        rule1, rule2, rule3 = TaskAutomationRule.objects.bulk_create([
+            TaskAutomationRule(
+                organization=org,
+                name=f"Rule {i}",
+                trigger_type=TaskAutomationRule.TriggerType.TASK_CREATED,
+                created_by=user
+            )
+            for i in range(1, 4)
+        ])
+        
+        # created_at is auto_now_add, so pin explicit timestamps for a deterministic order
+        now = timezone.now()
+        TaskAutomationRule.objects.filter(pk=rule1.pk).update(created_at=now - timedelta(seconds=2))
+        TaskAutomationRule.objects.filter(pk=rule2.pk).update(created_at=now - timedelta(seconds=1))
+        TaskAutomationRule.objects.filter(pk=rule3.pk).update(created_at=now)
+        
+        with django_assert_num_queries(1):
+            pks = list(TaskAutomationRule.objects.all().values_list("pk", flat=True))
+        assert pks == [rule3.pk, rule2.pk, rule1.pk]
 
 
 class TestTaskAutomationAction:
@@ -808,37 +791,39 @@ class TestTaskAutomationAction:
         """Test different automation action types."""
         rule = automation_rule_factory()
         
-        for action_choice in TaskAutomationAction.ActionType:
-            action = TaskAutomationAction.objects.create(
-                rule=rule,
-                action_type=action_choice
-            )
-            assert action.action_type == action_choice
+        TaskAutomationAction.objects.bulk_create([
+            TaskAutomationAction(rule=rule, action_type=action_choice)
+            for action_choice in TaskAutomationAction.ActionType
+        ])
+        
+        action_types = set(TaskAutomationAction.objects.filter(rule=rule).values_list("action_type", flat=True))
+        assert action_types == set(TaskAutomationAction.ActionType)
     
-    def test_action_ordering(self, automation_rule_factory):
+    def test_action_ordering(self, automation_rule_factory, django_assert_num_queries):
         """Test that actions are ordered by sort_order."""
         rule = automation_rule_factory()
         
-        action1 = TaskAutomationAction.objects.create(
-            rule=rule,
-            action_type=TaskAutomationAction.ActionType.CHANGE_STATUS,
-            sort_order=2
-        )
-        action2 = TaskAutomationAction.objects.create(
-            rule=rule,
-            action_type=TaskAutomationAction.ActionType.SET_PRIORITY,
-            sort_order=1
-        )
-        action3 = TaskAutomationAction.objects.create(
-            rule=rule,
-            action_type=TaskAutomationAction.ActionType.ASSIGN_USER,
-            sort_order=3
-        )
+        action1, action2, action3 = TaskAutomationAction.objects.bulk_create([
+            TaskAutomationAction(
+                rule=rule,
+                action_type=TaskAutomationAction.ActionType.CHANGE_STATUS,
+                sort_order=2
+            ),
+            TaskAutomationAction(
+                rule=rule,
+                action_type=TaskAutomationAction.ActionType.SET_PRIORITY,
+                sort_order=1
+            ),
+            TaskAutomationAction(
+                rule=rule,
+                action_type=TaskAutomationAction.ActionType.ASSIGN_USER,
+                sort_order=3
+            ),
+        ])
         
-        actions = list(TaskAutomationAction.objects.filter(rule=rule))
-        assert actions[0] == action2  # sort_order=1
-        assert actions[1] == action1  # sort_order=2
-        assert actions[2] == action3  # sort_order=3
+        with django_assert_num_queries(1):
+            pks = list(TaskAutomationAction.objects.filter(rule=rule).values_list("pk", flat=True))
+        assert pks == [action2.pk, action1.pk, action3.pk]
 
 
 class TestTaskAutomationLog:
@@ -863,48 +848,47 @@ class TestTaskAutomationLog:
     
     def test_log_status_choices(self, automation_rule_factory, task_factory):
         """Test different log statuses."""
-        rule = automation_rule_factory()
         task = task_factory()
+        rule = automation_rule_factory(
+            organization=task.project.organization,
+            created_by=task.project.created_by,
+        )
         
-        for status_choice in TaskAutomationLog.Status:
-            log = TaskAutomationLog.objects.create(
+        TaskAutomationLog.objects.bulk_create([
+            TaskAutomationLog(
                 rule=rule,
                 task=task,
                 status=status_choice,
                 message=f"Test {status_choice.value}"
             )
-            assert log.status == status_choice
+            for status_choice in TaskAutomationLog.Status
+        ])
+        
+        statuses = set(TaskAutomationLog.objects.filter(rule=rule).values_list("status", flat=True))
+        assert statuses == set(TaskAutomationLog.Status)
     
-    def test_log_ordering(self, automation_rule_factory, task_factory):
+    def test_log_ordering(self, automation_rule_factory, task_factory, django_assert_num_queries):
         """Test that logs are ordered by executed_at desc."""
-        rule = automation_rule_factory()
         task = task_factory()
+        rule = automation_rule_factory(
+            organization=task.project.organization,
+            created_by=task.project.created_by,
+        )
         
-        now = timezone.now()
+        log1, log2, log3 = TaskAutomationLog.objects.bulk_create([
+            TaskAutomationLog(rule=rule, task=task, status=TaskAutomationLog.Status.SUCCESS)
+            for _ in range(3)
+        ])
         
-        log1 = TaskAutomationLog.objects.create(
-            rule=rule,
-            task=task,
-            status=TaskAutomationLog.Status.SUCCESS,
-            executed_at=now - timedelta(hours=2)
-        )
-        log2 = TaskAutomationLog.objects.create(
-            rule=rule,
-            task=task,
-            status=TaskAutomationLog.Status.SUCCESS,
-            executed_at=now - timedelta(hours=1)
-        )
-        log3 = TaskAutomationLog.objects.create(
-            rule=rule,
-            task=task,
-            status=TaskAutomationLog.Status.SUCCESS,
-            executed_at=now
-        )
+        # executed_at is auto_now_add, so pin explicit timestamps for a deterministic order
+        now = timezone.now()
+        TaskAutomationLog.objects.filter(pk=log1.pk).update(executed_at=now - timedelta(hours=2))
+        TaskAutomationLog.objects.filter(pk=log2.pk).update(executed_at=now - timedelta(hours=1))
+        TaskAutomationLog.objects.filter(pk=log3.pk).update(executed_at=now)
         
-        logs = list(TaskAutomationLog.objects.all())
-        assert logs[0] == log3  # Most recent first
-        assert logs[1] == log2
-        assert logs[2] == log1
+        with django_assert_num_queries(1):
+            pks = list(TaskAutomationLog.objects.all().values_list("pk", flat=True))
+        assert pks == [log3.pk, log2.pk, log1.pk]
 
 
 class TestTaskButton:
@@ -932,18 +916,10 @@ class TestTaskButton:
         assert button.show_on_priority == []
         assert str(button) == "Start Timer"
     
-    def test_button_should_show_for_task(self, organization_factory, user_factory, task_factory):
+    def test_button_should_show_for_task(self, task_factory, django_assert_num_queries):
         """Test the should_show_for_task method."""
-        org = organization_factory()
-        user = user_factory()
         task = task_factory()
-        
-        # Create a label for testing
-        label = TaskLabel.objects.create(
-            organization=org,
-            name="Ready",
-            color="green"
-        )
+        org, user = task.project.organization, task.project.created_by
         
         # Button that shows on specific status
         status_button = TaskButton.objects.create(
@@ -954,27 +930,49 @@ class TestTaskButton:
         )
         
         # Should not show for TODO task
-        assert status_button.should_show_for_task(task) is False
+        with django_assert_num_queries(0):
+            assert status_button.should_show_for_task(task) is False
         
         # Change task status and test again
         task.status = Task.Status.IN_PROGRESS
         task.save()
-        assert status_button.should_show_for_task(task) is True
+        with django_assert_num_queries(0):
+            assert status_button.should_show_for_task(task) is True
+    
+    @pytest.mark.parametrize(
+        ("button_label_field", "has_label", "expected"),
+        [
+            ("show_when_has_label", False, False),
+            ("show_when_has_label", True, True),
+            ("hide_when_has_label", False, True),
+            ("hide_when_has_label", True, False),
+        ],
+        ids=["required-missing", "required-present", "hidden-missing", "hidden-present"],
+    )
+    def test_button_should_show_for_task_labels(
+        self, task_factory, django_assert_num_queries, button_label_field, has_label, expected
+    ):
+        """Test the label conditions of should_show_for_task against prefetched assignments."""
+        task = task_factory()
+        org, user = task.project.organization, task.project.created_by
         
-        # Button with required label
-        label_button = TaskButton.objects.create(
+        label = TaskLabel.objects.create(
+            organization=org,
+            name="Ready",
+            color="green"
+        )
+        button = TaskButton.objects.create(
             organization=org,
             name="Label Button",
-            show_when_has_label=label,
-            created_by=user
+            created_by=user,
+            **{button_label_field: label},
         )
+        if has_label:
+            TaskLabelAssignment.objects.create(task=task, label=label)
         
-        # Should not show without label
-        assert label_button.should_show_for_task(task) is False
-        
-        # Add label to task
-        TaskLabelAssignment.objects.create(task=task, label=label)
-        assert label_button.should_show_for_task(task) is True
+        task = Task.objects.prefetch_related("label_assignments__label").get(pk=task.pk)
+        with django_assert_num_queries(0):
+            assert button.should_show_for_task(task) is expected
 
 
 class TestEvent:
@@ -983,13 +981,14 @@ class TestEvent:
     def test_create_event(self, project_factory):
         """Test creating an event."""
         project = project_factory()
+        now = timezone.now()
         
         event = Event.objects.create(
             project=project,
             title="Team Meeting",
             description="Weekly team sync",
-            start_time=timezone.now() + timedelta(days=1),
-            end_time=timezone.now() + timedelta(days=1, hours=1),
+            start_time=now + timedelta(days=1),
+            end_time=now + timedelta(days=1, hours=1),
             location="Conference Room A",
             type=Event.Type.MEETING
         )
@@ -1001,16 +1000,8 @@ class TestEvent:
         assert event.location == "Conference Room A"
         assert str(event) == "Team Meeting"
     
-    def test_event_type_choices(self, project_factory):
+    @pytest.mark.parametrize("type_choice", EVENT_TYPES, ids=choice_id)
+    def test_event_type_choices(self, type_choice):
         """Test different event types."""
-        project = project_factory()
-        
-        for type_choice in Event.Type:
-            event = Event.objects.create(
-                project=project,
-                title=f"Test {type_choice.value}",
-                start_time=timezone.now(),
-                end_time=timezone.now() + timedelta(hours=1),
-                type=type_choice
-            )
-            assert event.type == type_choice
\ No newline at end of file
+        event = Event(type=type_choice)
+        assert clean_field(event, "type") == type_choice
@@ -3,11 +3,18 @@ Tests for tenant models (Organization, Membership, OrganizationInvitation).
 """
 
 import pytest
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from apps.tenants.models import Organization, Membership, OrganizationInvitation
 
+from .helpers import choice_id, clean_field
+
+User = get_user_model()
+MEMBERSHIP_ROLES = tuple(Membership.Role)
+
 
 class TestOrganization:
     """Test cases for Organization model."""
@@ -25,13 +32,13 @@ class TestOrganization:
         """Test that organization slugs must be unique."""
         Organization.objects.create(name="Org 1", slug="same-slug")
         
-        with pytest.raises(Exception):  # Should raise IntegrityError
-            Organization.objects.create(name="Org 2", slug="same-slug")
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                Organization.objects.create(name="Org 2", slug="same-slug")
     
-    def test_organization_str_representation(self, organization_factory):
+    def test_organization_str_representation(self):
         """Test string representation of organization."""
-        org = organization_factory(name="My Organization")
-        assert str(org) == "My Organization"
+        assert str(Organization(name="My Organization")) == "My Organization"
 
 
 class TestMembership:
@@ -66,32 +73,26 @@ class TestMembership:
         )
         
         # Attempt to create duplicate should fail
-        with pytest.raises(Exception):  # IntegrityError
-            Membership.objects.create(
-                organization=org,
-                user=user,
-                role=Membership.Role.ADMIN
-            )
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                Membership.objects.create(
+                    organization=org,
+                    user=user,
+                    role=Membership.Role.ADMIN
+                )
     
-    def test_membership_roles(self, organization_factory, user_factory):
+    @pytest.mark.parametrize("role_choice", MEMBERSHIP_ROLES, ids=choice_id)
+    def test_membership_roles(self, role_choice):
         """Test different membership roles."""
-        org = organization_factory()
-        
-        for role_choice in Membership.Role:
-            user = user_factory(email=f"test-{role_choice.value}@example.com")
-            membership = Membership.objects.create(
-                organization=org,
-                user=user,
-                role=role_choice
-            )
-            assert membership.role == role_choice
+        membership = Membership(role=role_choice)
+        assert clean_field(membership, "role") == role_choice
     
-    def test_membership_str_representation(self, organization_factory, user_factory):
+    def test_membership_str_representation(self):
         """Test string representation of membership."""
-        org = organization_factory(name="Test Org")
-        user = user_factory(email="test@example.com")
+        org = Organization(name="Test Org")
+        user = User(id=2, email="test@example.com")
         
-        membership = Membership.objects.create(
+        membership = Membership(
             organization=org,
             user=user,
             role=Membership.Role.ADMIN
@@ -126,59 +127,62 @@ class TestOrganizationInvitation:
     
     def test_invitation_status_choices(self, organization_factory, user_factory):
         """Test different invitation statuses."""
-        org = organization_factory()
         inviter = user_factory()
+        org = organization_factory(user=inviter)
         
-        for status_choice in OrganizationInvitation.Status:
-            invitation = OrganizationInvitation.objects.create(
+        OrganizationInvitation.objects.bulk_create([
+            OrganizationInvitation(
                 organization=org,
                 email=f"user-{status_choice.value}@example.com",
                 role=Membership.Role.MEMBER,
                 invited_by=inviter,
                 status=status_choice
             )
-            assert invitation.status == status_choice
+            for status_choice in OrganizationInvitation.Status
+        ])
+        
+        statuses = set(OrganizationInvitation.objects.filter(organization=org).values_list("status", flat=True))
+        assert statuses == set(OrganizationInvitation.Status)
     
-    def test_invitation_expiry(self, organization_factory, user_factory):
+    def test_invitation_expiry(self, organization_factory, user_factory, frozen_now):
         """Test invitation expiry functionality."""
-        org = organization_factory()
         inviter = user_factory()
+        org = organization_factory(user=inviter)
         
-        # Invitation without expiry date
-        invitation_no_expiry = OrganizationInvitation.objects.create(
-            organization=org,
-            email="no-expiry@example.com",
-            invited_by=inviter,
-            expires_at=None
-        )
-        assert invitation_no_expiry.is_expired() is False
-        
-        # Expired invitation
-        past_date = timezone.now() - timezone.timedelta(days=1)
-        invitation_expired = OrganizationInvitation.objects.create(
-            organization=org,
-            email="expired@example.com",
-            invited_by=inviter,
-            expires_at=past_date
-        )
-        assert invitation_expired.is_expired() is True
-        
-        # Future invitation
-        future_date = timezone.now() + timezone.timedelta(days=1)
-        invitation_future = OrganizationInvitation.objects.create(
-            organization=org,
-            email="future@example.com",
-            invited_by=inviter,
-            expires_at=future_date
-        )
-        assert invitation_future.is_expired() is False
+        OrganizationInvitation.objects.bulk_create([
+            # Invitation without expiry date
+            OrganizationInvitation(
+                organization=org,
+                email="no-expiry@example.com",
+                invited_by=inviter,
+                expires_at=None
+            ),
+            # Expired invitation
+            OrganizationInvitation(
+                organization=org,
+                email="expired@example.com",
+                invited_by=inviter,
+                expires_at=frozen_now - timezone.timedelta(days=1)
+            ),
+            # Future invitation
+            OrganizationInvitation(
+                organization=org,
+                email="future@example.com",
+                invited_by=inviter,
+                expires_at=frozen_now + timezone.timedelta(days=1)
+            ),
+        ])
+        
+        invitations = OrganizationInvitation.objects.filter(organization=org).only("email", "expires_at")
+        expired = {invitation.email: invitation.is_expired() for invitation in invitations}
+        assert expired == {
+            "no-expiry@example.com": False,
+            "expired@example.com": True,
+            "future@example.com": False,
+        }
     
     def test_invitation_unique_token(self, db):
         """Test that invitation tokens are unique."""
-        from apps.tenants.models import Organization, OrganizationInvitation
-        from django.contrib.auth import get_user_model
-        
-        User = get_user_model()
         org = Organization.objects.create(name="Test Org", slug="test-org")
         inviter = User.objects.create_user(
             "inviter@example.com",
@@ -199,4 +203,4 @@ class TestOrganizationInvitation:
             invited_by=inviter
         )
         
-        assert invitation1.token != invitation2.token
\ No newline at end of file
+        assert invitation1.token != invitation2.token
@@ -2,54 +2,90 @@
 Tests for web views and HTTP endpoints.
 """
 
+import json
+
 import pytest
 from django.urls import reverse
-from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
-from datetime import timedelta, datetime
-from unittest.mock import patch
+from datetime import UTC, datetime, timedelta
 
-from apps.projects.models import Project, Task, TaskTimeEntry, TaskLabel
-from apps.tenants.models import Organization, Membership
+from apps.projects.models import Project, Task
+from apps.tenants.models import Membership
 from apps.invoices.models import Invoice
 from apps.invoices.models import Company
 
+# For rows whose dates the assertions never look at; the views under test
+# apply no date filter unless a start/end range is requested.
+FIXED_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Marks a request as an HTMX call so views answer with their partial
+HTMX_HEADERS = {"HX-Request": "true"}
+
+# conftest.py runs django.setup() before test modules are imported, so the
+# URLconf is available here and each name is resolved once per run.
+HOME_URL = reverse("web:home")
+CALENDAR_URL = reverse("web:calendar")
+CALENDAR_EVENTS_URL = reverse("web:calendar_events")
+PROJECTS_URL = reverse("web:projects")
+PROJECTS_ARCHIVE_URL = reverse("web:projects_archive_page")
+TASKS_ARCHIVE_URL = reverse("web:tasks_archive")
+TASKS_CREATE_URL = reverse("web:tasks_create")
+TEAM_URL = reverse("web:team")
+ONBOARDING_URL = reverse("web:onboarding")
+INVOICES_URL = reverse("web:invoices")
+INVOICES_CREATE_URL = reverse("web:invoices_create")
+COMPANIES_URL = reverse("web:companies")
+COMPANIES_CREATE_URL = reverse("web:companies_create")
+LOGIN_URL = reverse("login")
+LOGOUT_URL = reverse("logout")
+REGISTER_URL = reverse("web_register")
+TASK_DETAIL_URL = reverse("web:tasks_detail", kwargs={"task_id": "12345678-1234-5678-9012-123456789012"})
+INVITE_ACCEPT_URL = reverse("web:invite_accept", kwargs={"token": "12345678-1234-5678-9012-123456789012"})
+
+
+class TestLoginRequired:
+    """App pages need a logged-in user with an active organization."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [HOME_URL, CALENDAR_URL, CALENDAR_EVENTS_URL, TASK_DETAIL_URL, PROJECTS_URL, TEAM_URL],
+        ids=["home", "calendar", "calendar_events", "task_detail", "projects", "team"],
+    )
+    def test_requires_login(self, client, url):
+        """Test that the page redirects anonymous users to login."""
+        response = client.get(url)
+        assert response.status_code == 302
 
-class TestDashboardViews:
-    """Test cases for dashboard views."""
+    @pytest.mark.parametrize(
+        "url,expected_status",
+        [
+            (HOME_URL, 302),  # Redirect to onboarding
+            (CALENDAR_URL, 302),  # Redirect to onboarding
+            (CALENDAR_EVENTS_URL, 401),
+        ],
+        ids=["home", "calendar", "calendar_events"],
+    )
+    def test_requires_active_org(self, authenticated_client, url, expected_status):
+        """Test that logged-in users without an active organization are turned away."""
+        response = authenticated_client.get(url)
+        assert response.status_code == expected_status
 
-    def test_app_home_requires_login(self, client):
-        """Test that dashboard requires login."""
-        response = client.get(reverse("web:home"))
-        assert response.status_code == 302  # Redirect to login
 
-    def test_app_home_requires_active_org(self, authenticated_client):
-        """Test that dashboard requires active organization."""
-        response = authenticated_client.get(reverse("web:home"))
-        assert response.status_code == 302  # Redirect to onboarding
+class TestDashboardViews:
+    """Test cases for dashboard views."""
 
-    def test_app_home_dashboard_data(self, active_organization, authenticated_client):
+    def test_app_home_dashboard_data(self, active_organization, auth_user, authenticated_client, project_with_tasks_factory):
         """Test dashboard displays correct data."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create some test data
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
-
-        task = Task.objects.create(
-            project=project,
-            title="Test Task",
-            assigned_to=user
+        project_with_tasks_factory(
+            active_organization, user,
+            task_specs=[{"title": "Test Task", "assigned_to": user}],
         )
 
         # Request dashboard
-        response = authenticated_client.get(reverse("web:home"))
+        response = authenticated_client.get(HOME_URL)
 
         assert response.status_code == 200
         assert "project_count" in response.context
@@ -57,244 +93,194 @@ class TestDashboardViews:
         assert response.context["project_count"] == 1
         assert response.context["task_count"] == 1
 
-    def test_calendar_page_requires_login(self, client):
-        """Test that calendar page requires login."""
-        response = client.get(reverse("web:calendar"))
-        assert response.status_code == 302  # Redirect to login
-
-    def test_calendar_page_requires_active_org(self, authenticated_client):
-        """Test that calendar page requires active organization."""
-        response = authenticated_client.get(reverse("web:calendar"))
-        assert response.status_code == 302  # Redirect to onboarding
-
-    def test_calendar_page_data(self, active_organization, authenticated_client):
+    def test_calendar_page_data(self, active_organization, auth_user, authenticated_client, project_with_tasks_factory, django_assert_num_queries):
         """Test calendar page displays correct data."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create test project
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
+        project, _ = project_with_tasks_factory(active_organization, user)
 
         # Request calendar page
-        response = authenticated_client.get(reverse("web:calendar"))
+        response = authenticated_client.get(CALENDAR_URL)
 
         assert response.status_code == 200
         assert "projects" in response.context
         assert "members" in response.context
-        assert list(response.context["projects"]) == [project]
+        # The template already evaluated the queryset; reading it back is free
+        with django_assert_num_queries(0):
+            assert list(response.context["projects"]) == [project]
 
 
 class TestCalendarAPI:
     """Test cases for calendar API endpoints."""
     
-    def test_calendar_events_requires_auth(self, client):
-        """Test that calendar events API requires authentication."""
-        response = client.get(reverse("web:calendar_events"))
-        assert response.status_code == 302
-    
-    def test_calendar_events_requires_active_org(self, authenticated_client):
-        """Test that calendar events API requires active organization."""
-        response = authenticated_client.get(reverse("web:calendar_events"))
-        assert response.status_code == 401
+    @pytest.fixture
+    def calendar_dataset(self, active_organization, auth_user, project_with_tasks_factory, frozen_now):
+        """Project with TODO, DONE and IN_PROGRESS tasks scheduled 1, 2 and 10 days out.
+
+        The clock is pinned for the whole test, so the view and the dataset
+        see the same "now".
+        """
+        user = auth_user
+        now = frozen_now
+        project, tasks = project_with_tasks_factory(
+            active_organization, user,
+            task_specs=[
+                {
+                    "title": "Todo Task",
+                    "status": Task.Status.TODO,
+                    "scheduled_start": now + timedelta(days=1),
+                    "duration_minutes": 60,
+                    "assigned_to": user,
+                },
+                {
+                    "title": "Done Task",
+                    "status": Task.Status.DONE,
+                    "scheduled_start": now + timedelta(days=2),
+                    "assigned_to": user,
+                },
+                {
+                    "title": "Future Task",
+                    "status": Task.Status.IN_PROGRESS,
+                    "scheduled_start": now + timedelta(days=10),
+                    "assigned_to": user,
+                },
+            ],
+        )
+        return {"user": user, "project": project, "tasks": tasks, "now": now}
     
-    def test_calendar_events_basic_functionality(self, active_organization, authenticated_client):
-        """Test basic calendar events functionality."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
-
-        # Create test project
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
-
-        # Create scheduled task
-        scheduled_task = Task.objects.create(
-            project=project,
-            title="Scheduled Task",
-            scheduled_start=timezone.now() + timedelta(days=1),
-            duration_minutes=60,
-            assigned_to=user
-        )
+    def test_calendar_events_unfiltered(self, authenticated_client, calendar_dataset, django_assert_max_num_queries):
+        """Test the unfiltered feed: every scheduled task plus the project span."""
+        user = calendar_dataset["user"]
 
-        # Request calendar events
-        response = authenticated_client.get(reverse("web:calendar_events"))
+        # Request calendar events: session, user, active org + membership,
+        # tasks (project/assignee joined) and project spans
+        with django_assert_max_num_queries(6):
+            response = authenticated_client.get(CALENDAR_EVENTS_URL)
 
         assert response.status_code == 200
         events = response.json()
 
-        # Should have at least the scheduled task event
-        assert len(events) >= 1
+        # All scheduled tasks, ordered by start
+        task_events = [e for e in events if not e.get("allDay")]
+        assert [e["extendedProps"]["task_title"] for e in task_events] == ["Todo Task", "Done Task", "Future Task"]
+
+        # Task event payload
+        task_event = task_events[0]
+        assert task_event["title"] == "Todo Task · " + user.email
+        assert task_event["extendedProps"]["assigned_to"] == str(user.id)
+        assert task_event["extendedProps"]["status"] == "TODO"
 
-        # Find our task event
-        task_event = next(
-            (event for event in events if event.get("extendedProps", {}).get("task_title") == "Scheduled Task"),
+        # Project span event
+        project_span = next(
+            (event for event in events if event.get("extendedProps", {}).get("kind") == "project_span"),
             None
         )
-        assert task_event is not None
-        assert task_event["title"] == "Scheduled Task · " + user.email
-        assert task_event["extendedProps"]["assigned_to"] == str(user.id)
+        assert project_span is not None
+        assert project_span["title"] == calendar_dataset["project"].title
+        assert project_span["allDay"] is True
+        assert project_span["editable"] is False
     
-    def test_calendar_events_filtering(self, active_organization, authenticated_client):
+    @pytest.mark.parametrize(
+        "params,expected_titles",
+        [
+            ({"status": "TODO"}, ["Todo Task"]),
+            ({"hide_done": "true"}, ["Todo Task", "Future Task"]),
+            ({"project": "{project_id}"}, ["Todo Task", "Done Task", "Future Task"]),
+        ],
+        ids=["status", "hide_done", "project"],
+    )
+    def test_calendar_events_filtering(self, authenticated_client, calendar_dataset, params, expected_titles, django_assert_max_num_queries):
         """Test calendar events filtering parameters."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
-
-        # Create test project
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
-
-        # Create tasks with different statuses
-        todo_task = Task.objects.create(
-            project=project,
-            title="Todo Task",
-            status=Task.Status.TODO,
-            scheduled_start=timezone.now() + timedelta(days=1),
-            assigned_to=user
-        )
-
-        done_task = Task.objects.create(
-            project=project,
-            title="Done Task",
-            status=Task.Status.DONE,
-            scheduled_start=timezone.now() + timedelta(days=2),
-            assigned_to=user
-        )
-
-        # Test status filter
-        response = authenticated_client.get(
-            reverse("web:calendar_events") + "?status=TODO"
-        )
-        events = response.json()
-        task_events = [e for e in events if not e.get("allDay")]
-        assert len(task_events) == 1
-        assert task_events[0]["extendedProps"]["status"] == "TODO"
-
-        # Test hide_done filter
-        response = authenticated_client.get(
-            reverse("web:calendar_events") + "?hide_done=true"
-        )
-        events = response.json()
-        task_events = [e for e in events if not e.get("allDay")]
-        assert len(task_events) == 1  # Only TODO task
-        assert task_events[0]["extendedProps"]["status"] == "TODO"
+        project_id = calendar_dataset["project"].id
+        params = {key: value.format(project_id=project_id) for key, value in params.items()}
 
-        # Test project filter
-        response = authenticated_client.get(
-            reverse("web:calendar_events") + f"?project={project.id}"
-        )
+        # Filters narrow the same two event queries; they must not add more
+        with django_assert_max_num_queries(6):
+            response = authenticated_client.get(CALENDAR_EVENTS_URL, params)
         events = response.json()
         task_events = [e for e in events if not e.get("allDay")]
-        assert len(task_events) == 2  # Both tasks
+        assert [e["extendedProps"]["task_title"] for e in task_events] == expected_titles
     
-    def test_calendar_events_date_range(self, active_organization, authenticated_client):
+    def test_calendar_events_date_range(self, authenticated_client, calendar_dataset, django_assert_max_num_queries):
         """Test calendar events date range filtering."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
-
-        # Create test project
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
-
-        # Create tasks with different dates
-        now = timezone.now()
-        Task.objects.create(
-            project=project,
-            title="Today Task",
-            scheduled_start=now,
-            assigned_to=user
-        )
-
-        Task.objects.create(
-            project=project,
-            title="Future Task",
-            scheduled_start=now + timedelta(days=10),
-            assigned_to=user
-        )
-
-        # Test date range filtering
-        start_date = (now + timedelta(days=5)).isoformat().replace('+', '%2B')
-        end_date = (now + timedelta(days=15)).isoformat().replace('+', '%2B')
-
-        response = authenticated_client.get(
-            reverse("web:calendar_events") + f"?start={start_date}&end={end_date}"
-        )
+        now = calendar_dataset["now"]
+
+        # Test date range filtering; the client URL-encodes the "+" offsets
+        with django_assert_max_num_queries(6):
+            response = authenticated_client.get(
+                CALENDAR_EVENTS_URL,
+                {
+                    "start": (now + timedelta(days=5)).isoformat(),
+                    "end": (now + timedelta(days=15)).isoformat(),
+                },
+            )
         events = response.json()
         task_events = [e for e in events if not e.get("allDay")]
 
-        # Should only include future task
-        assert len(task_events) == 1
-        assert task_events[0]["extendedProps"]["task_title"] == "Future Task"
-    
-    def test_calendar_events_project_spans(self, active_organization, authenticated_client):
-        """Test that project spans are included in calendar events."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
-
-        # Create project with span dates
-        start_date = timezone.now().date()
-        end_date = (timezone.now() + timedelta(days=30)).date()
-
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Long Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
+        # Should only include future task; the overlapping project span stays
+        assert [e["extendedProps"]["task_title"] for e in task_events] == ["Future Task"]
+        assert [e["title"] for e in events if e.get("allDay")] == [calendar_dataset["project"].title]
+
+
+class TestViewQueryCounts:
+    """Query counts of the list views must not grow with the number of rows."""
+
+    @staticmethod
+    def _seed(project_with_tasks_factory, org, user, title):
+        now = FIXED_NOW
+        project_with_tasks_factory(
+            org, user,
+            title=title,
+            task_specs=[
+                {
+                    "title": f"{title} task {i}",
+                    "scheduled_start": now + timedelta(days=i),
+                    "assigned_to": user,
+                    "is_archived": i % 2 == 1,
+                    "archived_at": now if i % 2 == 1 else None,
+                    "archived_by": user if i % 2 == 1 else None,
+                }
+                for i in range(4)
+            ],
+        )
+
+    @pytest.mark.parametrize(
+        "url",
+        [HOME_URL, CALENDAR_URL, CALENDAR_EVENTS_URL, TASKS_ARCHIVE_URL, PROJECTS_URL],
+        ids=["home", "calendar", "calendar_events", "tasks_archive", "projects"],
+    )
+    def test_query_count_independent_of_rows(
+        self, active_organization, auth_user, authenticated_client, project_with_tasks_factory,
+        url, django_assert_max_num_queries, django_assert_num_queries,
+    ):
+        """Adding projects and tasks must not add queries (no per-row lookups)."""
+        self._seed(project_with_tasks_factory, active_organization, auth_user, "Project 0")
+
+        # Warm up once so one-off work (session writes, caches) is not counted
+        authenticated_client.get(url)
+        with django_assert_max_num_queries(10) as captured:
+            response = authenticated_client.get(url)
+        assert response.status_code == 200
+        baseline = len(captured.captured_queries)
 
-        # Request calendar events
-        response = authenticated_client.get(reverse("web:calendar_events"))
-        events = response.json()
+        for i in range(1, 4):
+            self._seed(project_with_tasks_factory, active_organization, auth_user, f"Project {i}")
 
-        # Find project span event
-        project_span = next(
-            (event for event in events if event.get("extendedProps", {}).get("kind") == "project_span"),
-            None
-        )
-        assert project_span is not None
-        assert project_span["title"] == "Long Project"
-        assert project_span["allDay"] is True
-        assert project_span["editable"] is False
+        with django_assert_num_queries(baseline):
+            response = authenticated_client.get(url)
+        assert response.status_code == 200
 
 
 class TestTaskViews:
     """Test cases for task-related views."""
 
-    def test_task_detail_requires_login(self, client):
-        """Test that task detail requires login."""
-        response = client.get(reverse("web:tasks_detail", kwargs={"task_id": "12345678-1234-5678-9012-123456789012"}))
-        assert response.status_code == 302  # Redirect to login
-
-    def test_task_create_web_view(self, authenticated_client, organization_factory, project_factory, user_factory):
+    def test_task_create_web_view(self, active_organization, auth_user, authenticated_client, project_factory):
         """Test task creation via web view."""
-        user = user_factory()
-        authenticated_client.force_login(user)
-        org = organization_factory(user=user)
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
+        user = auth_user
 
         # Create test project
-        project = project_factory(organization=org, created_by=user)
+        project = project_factory(organization=active_organization, created_by=user)
 
         # Test task creation
         data = {
@@ -303,37 +289,29 @@ class TestTaskViews:
             "assigned_to": str(user.id),
         }
 
-        response = authenticated_client.post(reverse("web:tasks_create"), data, headers={"HX-Request": "true"})
+        response = authenticated_client.post(TASKS_CREATE_URL, data, headers=HTMX_HEADERS)
 
         # Should return HTMX response (rendered template)
         assert response.status_code == 200
-        # Check that task was created
-        task = Task.objects.filter(title="New Test Task", project=project).first()
-        assert task is not None
-        assert task.assigned_to == user
-
-    def test_task_archive_view(self, active_organization, authenticated_client):
+        # Check that task was created; the HX-Trigger event carries its id
+        task_id = json.loads(response.headers["HX-Trigger"])["taskCreated"]["task_id"]
+        task = Task.objects.only("title", "project_id", "assigned_to_id").get(pk=task_id)
+        assert task.title == "New Test Task"
+        assert task.project_id == project.id
+        assert task.assigned_to_id == user.id
+
+    def test_task_archive_view(self, active_organization, auth_user, authenticated_client, project_with_tasks_factory):
         """Test task archive view."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create test project and task
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
-
-        task = Task.objects.create(
-            project=project,
-            title="Archive Task",
-            assigned_to=user
+        project_with_tasks_factory(
+            active_organization, user,
+            task_specs=[{"title": "Archive Task", "assigned_to": user}],
         )
 
         # Request archive page
-        response = authenticated_client.get(reverse("web:tasks_archive"))
+        response = authenticated_client.get(TASKS_ARCHIVE_URL)
 
         assert response.status_code == 200
         assert "archived_tasks" in response.context
@@ -345,59 +323,50 @@ class TestTaskViews:
 class TestProjectViews:
     """Test cases for project-related views."""
 
-    def test_project_page_requires_login(self, client):
-        """Test that project page requires login."""
-        response = client.get(reverse("web:projects"))
-        assert response.status_code == 302  # Redirect to login
-
-    def test_project_page_data(self, active_organization, authenticated_client):
+    def test_project_page_data(self, active_organization, auth_user, authenticated_client, project_with_tasks_factory, django_assert_num_queries):
         """Test project page displays correct data."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create test project
-        project = Project.objects.create(
-            organization=active_organization,
-            title="Test Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user
-        )
+        project, _ = project_with_tasks_factory(active_organization, user)
 
         # Request project page
-        response = authenticated_client.get(reverse("web:projects"))
+        response = authenticated_client.get(PROJECTS_URL)
 
         assert response.status_code == 200
         assert "projects" in response.context
-        assert project in response.context["projects"]
+        # The template already evaluated the queryset; reading it back is free
+        with django_assert_num_queries(0):
+            assert list(response.context["projects"]) == [project]
 
-    def test_project_archive_page(self, active_organization, authenticated_client):
+    def test_project_archive_page(self, active_organization, auth_user, authenticated_client):
         """Test archived projects page."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create active and archived projects
-        active_project = Project.objects.create(
-            organization=active_organization,
-            title="Active Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user,
-            is_archived=False
-        )
-
-        archived_project = Project.objects.create(
-            organization=active_organization,
-            title="Archived Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user,
-            is_archived=True,
-            archived_at=timezone.now()
-        )
+        now = FIXED_NOW
+        active_project, archived_project = Project.objects.bulk_create([
+            Project(
+                organization=active_organization,
+                title="Active Project",
+                start_date=now,
+                end_date=now + timedelta(days=30),
+                created_by=user,
+                is_archived=False,
+            ),
+            Project(
+                organization=active_organization,
+                title="Archived Project",
+                start_date=now,
+                end_date=now + timedelta(days=30),
+                created_by=user,
+                is_archived=True,
+                archived_at=now,
+            ),
+        ])
 
         # Request archive page
-        response = authenticated_client.get(reverse("web:projects_archive_page"))
+        response = authenticated_client.get(PROJECTS_ARCHIVE_URL)
 
         assert response.status_code == 200
         assert "archived_projects" in response.context
@@ -405,33 +374,34 @@ class TestProjectViews:
         assert len(archived_projects) == 1
         assert archived_projects[0] == archived_project
 
-    def test_project_page_filters_archived(self, active_organization, authenticated_client):
+    def test_project_page_filters_archived(self, active_organization, auth_user, authenticated_client):
         """Test that project page filters out archived projects."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
+        user = auth_user
 
         # Create active and archived projects
-        active_project = Project.objects.create(
-            organization=active_organization,
-            title="Active Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user,
-            is_archived=False
-        )
-
-        archived_project = Project.objects.create(
-            organization=active_organization,
-            title="Archived Project",
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(days=30),
-            created_by=user,
-            is_archived=True,
-            archived_at=timezone.now()
-        )
+        now = FIXED_NOW
+        active_project, archived_project = Project.objects.bulk_create([
+            Project(
+                organization=active_organization,
+                title="Active Project",
+                start_date=now,
+                end_date=now + timedelta(days=30),
+                created_by=user,
+                is_archived=False,
+            ),
+            Project(
+                organization=active_organization,
+                title="Archived Project",
+                start_date=now,
+                end_date=now + timedelta(days=30),
+                created_by=user,
+                is_archived=True,
+                archived_at=now,
+            ),
+        ])
 
         # Request projects page
-        response = authenticated_client.get(reverse("web:projects"))
+        response = authenticated_client.get(PROJECTS_URL)
 
         assert response.status_code == 200
         assert "projects" in response.context
@@ -444,23 +414,15 @@ class TestProjectViews:
 class TestTeamViews:
     """Test cases for team-related views."""
     
-    def test_team_page_requires_login(self, client):
-        """Test that team page requires login."""
-        response = client.get(reverse("web:team"))
-        assert response.status_code == 302  # Redirect to login
-
     def test_team_invite_accept_requires_token(self, client):
         """Test that team invite accept requires valid token."""
-        response = client.get(reverse("web:invite_accept", kwargs={"token": "12345678-1234-5678-9012-123456789012"}))
+        response = client.get(INVITE_ACCEPT_URL)
         assert response.status_code == 302  # Redirect to login since not authenticated
 
     def test_team_page_data(self, active_organization, authenticated_client):
         """Test team page displays correct data."""
-        user = active_organization.memberships.first().user
-        authenticated_client.force_login(user)
-
         # Request team page
-        response = authenticated_client.get(reverse("web:team"))
+        response = authenticated_client.get(TEAM_URL)
 
         assert response.status_code == 200
         assert "org" in response.context
@@ -472,7 +434,7 @@ class TestOnboardingViews:
     
     def test_onboarding_page(self, client):
         """Test onboarding page accessibility."""
-        response = client.get(reverse("web:onboarding"))
+        response = client.get(ONBOARDING_URL)
         assert response.status_code in [200, 302]  # May redirect if already has org
     
     def test_onboarding_create_organization(self, authenticated_client):
@@ -484,17 +446,11 @@ class TestOnboardingViews:
 
 class TestInvoiceViews:
     @pytest.mark.django_db
-    def test_invoices_page_filters_by_company(self, client, user_factory, organization_factory, company_factory):
-        user = user_factory()
-        org = organization_factory(user=user)
+    def test_invoices_page_filters_by_company(self, active_organization, auth_user, authenticated_client, company_factory):
+        user, org, client = auth_user, active_organization, authenticated_client
         company_a = company_factory(organization=org, owner=user, name="Company A")
         company_b = company_factory(organization=org, owner=user, name="Company B")
 
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
-
         Invoice.objects.create(
             organization=org,
             company=company_a,
@@ -514,31 +470,25 @@ class TestInvoiceViews:
             created_by=user,
         )
 
-        url = reverse("web:invoices")
+        url = INVOICES_URL
         resp = client.get(url, {"company": str(company_a.id)})
         assert resp.status_code == 200
-        assert reverse("web:companies") in resp.content.decode("utf-8")
+        assert COMPANIES_URL in resp.content.decode("utf-8")
         invoices = list(resp.context["invoices"])
         assert len(invoices) == 1
         assert invoices[0].company_id == company_a.id
 
     @pytest.mark.django_db
-    def test_invoices_create_defaults_pdf_template_from_company(self, client, user_factory, organization_factory, company_factory):
-        user = user_factory()
-        org = organization_factory(user=user)
+    def test_invoices_create_defaults_pdf_template_from_company(self, active_organization, auth_user, authenticated_client, company_factory):
+        user, org, client = auth_user, active_organization, authenticated_client
         company = company_factory(
             organization=org,
             owner=user,
             default_pdf_template=Invoice.PdfTemplate.MINIMAL,
         )
 
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
-
         resp = client.post(
-            reverse("web:invoices_create"),
+            INVOICES_CREATE_URL,
             {
                 "company": str(company.id),
                 "recipient_name": "Test",
@@ -548,7 +498,7 @@ class TestInvoiceViews:
                 "invoice_date": "2026-01-21",
                 "service_date": "2026-01-21",
             },
-            headers={"HX-Request": "true"},
+            headers=HTMX_HEADERS,
         )
         assert resp.status_code == 200
         invoice = Invoice.objects.filter(organization=org, company=company).order_by("-created_at").first()
@@ -558,37 +508,25 @@ class TestInvoiceViews:
 
 class TestCompanyViews:
     @pytest.mark.django_db
-    def test_companies_page_shows_only_user_companies(self, client, user_factory, organization_factory, company_factory):
-        user = user_factory()
-        org = organization_factory(user=user)
+    def test_companies_page_shows_only_user_companies(self, active_organization, auth_user, authenticated_client, company_factory, user_factory):
+        user, org, client = auth_user, active_organization, authenticated_client
         other_user = user_factory()
 
         company_factory(organization=org, owner=user, name="Mine")
         company_factory(organization=org, owner=other_user, name="Other")
 
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
-
-        resp = client.get(reverse("web:companies"))
+        resp = client.get(COMPANIES_URL)
         assert resp.status_code == 200
         companies = list(resp.context["companies"])
         assert len(companies) == 1
         assert companies[0].owner_id == user.id
 
     @pytest.mark.django_db
-    def test_companies_create_creates_company(self, client, user_factory, organization_factory):
-        user = user_factory()
-        org = organization_factory(user=user)
-
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
+    def test_companies_create_creates_company(self, active_organization, auth_user, authenticated_client):
+        user, org, client = auth_user, active_organization, authenticated_client
 
         resp = client.post(
-            reverse("web:companies_create"),
+            COMPANIES_CREATE_URL,
             {
                 "name": "My Company",
                 "tagline": "Tag",
@@ -604,7 +542,7 @@ class TestCompanyViews:
                 "bic": "BIC",
                 "bank_name": "Bank",
             },
-            headers={"HX-Request": "true"},
+            headers=HTMX_HEADERS,
         )
         assert resp.status_code == 200
         company = Company.objects.get(name="My Company")
@@ -612,21 +550,19 @@ class TestCompanyViews:
         assert company.organization_id == org.id
 
     @pytest.mark.django_db
-    def test_companies_create_allows_logo_upload(self, client, user_factory, organization_factory, settings, tmp_path):
-        settings.MEDIA_ROOT = tmp_path
+    def test_companies_create_allows_logo_upload(self, active_organization, authenticated_client, settings):
+        # Keep the uploaded logo in memory instead of writing it to disk
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        }
 
-        user = user_factory()
-        org = organization_factory(user=user)
-
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
+        client = authenticated_client
 
         uploaded = SimpleUploadedFile("logo.png", b"dummy", content_type="image/png")
 
         resp = client.post(
-            reverse("web:companies_create"),
+            COMPANIES_CREATE_URL,
             {
                 "name": "Logo Company",
                 "tagline": "",
@@ -643,7 +579,7 @@ class TestCompanyViews:
                 "theme_color_accent": "#c9a227",
                 "logo": uploaded,
             },
-            headers={"HX-Request": "true"},
+            headers=HTMX_HEADERS,
         )
         assert resp.status_code == 200
         company = Company.objects.get(name="Logo Company")
@@ -651,16 +587,10 @@ class TestCompanyViews:
         assert company.logo.name
 
     @pytest.mark.django_db
-    def test_companies_update_updates_theme(self, client, user_factory, organization_factory, company_factory):
-        user = user_factory()
-        org = organization_factory(user=user)
+    def test_companies_update_updates_theme(self, active_organization, auth_user, authenticated_client, company_factory):
+        user, org, client = auth_user, active_organization, authenticated_client
         company = company_factory(organization=org, owner=user)
 
-        client.force_login(user)
-        session = client.session
-        session["active_org_id"] = str(org.id)
-        session.save()
-
         resp = client.post(
             reverse("web:companies_update", kwargs={"company_id": company.id}),
             {
@@ -704,24 +634,20 @@ class TestCompanyViews:
 
 class TestAuthenticationViews:
     """Test cases for authentication views."""
-    
-    def test_login_page(self, client):
-        """Test login page accessibility."""
-        response = client.get(reverse("login"))
-        assert response.status_code == 200
 
-    def test_register_page(self, client):
-        """Test registration page accessibility."""
-        response = client.get(reverse("web_register"))
+    @pytest.mark.parametrize("url", [LOGIN_URL, REGISTER_URL], ids=["login", "register"])
+    def test_auth_pages_accessible(self, client, url):
+        """Test login and registration pages are accessible anonymously."""
+        response = client.get(url)
         assert response.status_code == 200
 
     def test_logout(self, authenticated_client):
         """Test logout functionality."""
-        response = authenticated_client.post(reverse("logout"))
+        response = authenticated_client.post(LOGOUT_URL)
         assert response.status_code == 302  # Redirect after logout
 
         # Verify user is logged out
-        response = authenticated_client.get(reverse("web:home"))
+        response = authenticated_client.get(HOME_URL)
         assert response.status_code == 302  # Should redirect to login
 
 
@@ -734,15 +660,16 @@ class TestMiddleware:
         org = organization_factory()
 
         # Set active organization in session
-        authenticated_client.session["active_org_id"] = str(org.id)
-        authenticated_client.session.save()
+        session = authenticated_client.session
+        session["active_org_id"] = str(org.id)
+        session.save()
 
         # Request should have active_org in context
-        response = authenticated_client.get(reverse("web:home"))
+        response = authenticated_client.get(HOME_URL)
         # This test would depend on how the middleware sets the active_org
 
     def test_active_organization_middleware_no_org(self, authenticated_client):
         """Test ActiveOrganizationMiddleware when no organization is set."""
         # Request without active organization
-        response = authenticated_client.get(reverse("web:home"))
+        response = authenticated_client.get(HOME_URL)
         assert response.status_code == 302  # Should redirect to onboarding
\ No newline at end of file
@@ -7,19 +7,47 @@ This script provides convenient commands for running tests with UV Python.
 
 import os
 import sys
-import subprocess
-import argparse
+from functools import lru_cache
 from pathlib import Path
 
+# argparse, shlex and subprocess are imported where they are used so that
+# the bare "python uv_test.py" help screen only loads argparse.
 
-def run_command(cmd, check=True):
-    """Run a shell command and return the result."""
-    print(f"🔧 Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, check=check)
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=1)
+def stdout_is_tty():
+    """Whether stdout is an interactive terminal (checked once per process)."""
+    return sys.stdout.isatty()
+
+
+def icon(emoji):
+    """Emoji prefix for terminal output; CI logs and pipes get plain text."""
+    return f"{emoji} " if stdout_is_tty() else ""
+
+
+def emit(lines):
+    """Write a block of lines with a single write call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def run_command(argv, check=True, env=None, cwd=None):
+    """Run a command (argv list, no shell) and return whether it succeeded."""
+    import shlex
+    import subprocess
+
+    emit([f"{icon('🔧')}Running: {shlex.join(argv)}"])
+    result = subprocess.run(argv, check=check, env=env, cwd=cwd)
     return result.returncode == 0
 
 
-def main():
+@lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command-line parser (once per process)."""
+    import argparse
+
     parser = argparse.ArgumentParser(description="Run tests with UV Python for the project manager backend")
     parser.add_argument("--coverage", action="store_true", help="Run tests with coverage report")
     parser.add_argument("--html", action="store_true", help="Generate HTML coverage report")
@@ -29,21 +57,58 @@ def main():
     parser.add_argument("--no-cov", action="store_true", help="Disable coverage")
     parser.add_argument("--file", "-f", help="Run specific test file")
     parser.add_argument("--pattern", help="Run tests matching pattern")
-    parser.add_argument("--parallel", "-n", type=int, help="Run tests in parallel (requires pytest-xdist)")
+    parser.add_argument("--parallel", "-n", type=int, help="Number of parallel workers (default: auto, from pytest.ini)")
+    parser.add_argument("--serial", action="store_true", help="Run tests in a single process (same as -n 0)")
+    parser.add_argument(
+        "--dist",
+        choices=["load", "loadfile", "loadscope", "worksteal"],
+        help="How xdist spreads tests over workers (default: loadscope, from pytest.ini)",
+    )
     parser.add_argument("--slow", action="store_true", help="Include slow tests")
     parser.add_argument("--update-snapshots", action="store_true", help="Update test snapshots")
+    parser.add_argument("--cached", action="store_true", help="Keep pytest's .pytest_cache (off by default)")
+    parser.add_argument("--exec", action="store_true", help="Replace this process with pytest (no summary banner)")
+    parser.add_argument("--collect-only", action="store_true", help="Only list the tests (no coverage, no banner)")
+    parser.add_argument("--junit", action="store_true", help="Write a JUnit XML report to .pytest-junit.xml")
+    parser.add_argument("--profile", action="store_true", help="Report the slowest tests; record profile.svg if py-spy is installed")
+    rerun = parser.add_mutually_exclusive_group()
+    rerun.add_argument("--lf", action="store_true", help="Re-run only the tests that failed last time (implies --cached)")
+    rerun.add_argument("--ff", action="store_true", help="Run last failures first, then the rest (implies --cached)")
+    parser.add_argument(
+        "--changed",
+        nargs="?",
+        const="origin/main",
+        metavar="BASE",
+        help="Only run test files for apps changed since BASE (default: origin/main)",
+    )
+    return parser
+
+
+def main(argv=None):
+    import shlex
+
+    args = _build_parser().parse_args(argv)
     
-    args = parser.parse_args()
+    # Listing tests needs neither coverage tracing nor xdist workers
+    if args.collect_only:
+        args.coverage = False
+        args.no_cov = True
+        args.serial = True
     
     # Base command with UV
     cmd_parts = ["uv", "run", "pytest"]
     
-    # Add test discovery
-    cmd_parts.append("tests/")
+    # Test discovery defaults to testpaths in pytest.ini
+    if args.changed:
+        cmd_parts.extend(changed_test_paths(args.changed) or [])
     
-    # Parallel execution
-    if args.parallel:
+    # Parallel execution; pytest.ini already runs "-n auto --dist=loadscope"
+    if args.serial:
+        cmd_parts.extend(["-n", "0"])
+    elif args.parallel is not None:
         cmd_parts.extend(["-n", str(args.parallel)])
+    if args.dist and not args.serial:
+        cmd_parts.append(f"--dist={args.dist}")
     
     # Verbosity
     if args.verbose:
@@ -55,14 +120,17 @@ def main():
     
     # Coverage
     if args.coverage and not args.no_cov:
+        # Source roots come from [tool.coverage.run] in pyproject.toml
         cmd_parts.extend([
-            "--cov=apps",
-            "--cov=config", 
+            "--cov",
             "--cov-report=term-missing"
         ])
         
         if args.html:
             cmd_parts.append("--cov-report=html")
+    elif args.no_cov:
+        # pytest.ini enables coverage for every run; switch it off explicitly
+        cmd_parts.append("--no-cov")
     
     # Markers
     if args.markers:
@@ -83,54 +151,152 @@ def main():
     if args.update_snapshots:
         cmd_parts.append("--snapshot-update")
     
-    # Additional useful options
-    cmd_parts.extend([
-        "--tb=short",
-        "--disable-warnings",
-        "--strict-markers",
-    ])
+    if args.collect_only:
+        cmd_parts.append("--collect-only")
+    
+    # JUnit XML is opt-in; captured output stays out of the report
+    if args.junit:
+        cmd_parts.extend(["--junitxml=.pytest-junit.xml", "-o", "junit_logging=no"])
     
-    cmd = " ".join(cmd_parts)
+    # --lf/--ff read the failures recorded in .pytest_cache
+    if args.lf or args.ff:
+        args.cached = True
+        cmd_parts.append("--lf" if args.lf else "--ff")
     
-    # Change to backend directory
-    backend_dir = Path(__file__).parent
-    os.chdir(backend_dir)
+    # Skip reading/writing .pytest_cache unless asked for
+    if not args.cached:
+        cmd_parts.extend(["-p", "no:cacheprovider"])
+    
+    # Slowest tests, plus a flame graph when py-spy is available. uv and the
+    # xdist workers run as child processes, hence --subprocesses.
+    profile_svg = False
+    if args.profile:
+        import shutil
+
+        cmd_parts.extend(["--durations=25", "--durations-min=0.5"])
+        if shutil.which("py-spy"):
+            cmd_parts[:0] = ["py-spy", "record", "--subprocesses", "-o", "profile.svg", "--"]
+            profile_svg = True
     
-    print("=" * 70)
-    print("🧪 Running tests with UV Python - Project Manager Backend")
-    print("=" * 70)
-    print(f"📋 Command: {cmd}")
-    print(f"📁 Working directory: {os.getcwd()}")
-    print(f"🐍 UV Version: {get_uv_version()}")
-    print("=" * 70)
+    cmd = shlex.join(cmd_parts)
+    
+    env = os.environ.copy()
+    if not args.no_cov:
+        # Python 3.12+ (see requires-python): sys.monitoring-based tracing
+        # costs far less than the line tracer; an explicit setting wins
+        env.setdefault("COVERAGE_CORE", "sysmon")
+    
+    if not args.collect_only:
+        banner = [
+            "=" * 70,
+            f"{icon('🧪')}Running tests with UV Python - Project Manager Backend",
+            "=" * 70,
+            f"{icon('📋')}Command: {cmd}",
+            f"{icon('📁')}Working directory: {_BACKEND_DIR}",
+        ]
+        # Spawning "uv --version" costs a process; only do it for a human reader
+        if stdout_is_tty():
+            banner.append(f"🐍 UV Version: {get_uv_version()}")
+        banner.append("=" * 70)
+        emit(banner)
+    
+    # Hand the process over to pytest; its exit code becomes ours
+    if args.exec or args.collect_only:
+        # exec has no cwd argument; the process is replaced right after
+        os.chdir(_BACKEND_DIR)
+        os.execvpe(cmd_parts[0], cmd_parts, env)
     
     # Run the tests
-    success = run_command(cmd, check=False)
+    success = run_command(cmd_parts, check=False, env=env, cwd=_BACKEND_DIR)
+    
+    if profile_svg:
+        emit([f"{icon('🔥')}Profile written to: {os.path.join(_BACKEND_DIR, 'profile.svg')}"])
     
     if success:
-        print("\n" + "=" * 70)
-        print("✅ All tests passed!")
-        print("=" * 70)
+        summary = ["", "=" * 70, f"{icon('✅')}All tests passed!", "=" * 70]
         
         if args.coverage and not args.no_cov:
-            print("\n📊 Coverage report generated")
+            summary += ["", f"{icon('📊')}Coverage report generated"]
             if args.html:
-                print("📄 HTML report available in: htmlcov/index.html")
-                print("🌐 Open in browser: open htmlcov/index.html")
+                summary += [
+                    f"{icon('📄')}HTML report available in: htmlcov/index.html",
+                    f"{icon('🌐')}Open in browser: open htmlcov/index.html",
+                ]
+        emit(summary)
     else:
-        print("\n" + "=" * 70)
-        print("❌ Some tests failed!")
-        print("=" * 70)
-        print("\n💡 Tips:")
-        print("   • Run with --verbose for detailed output")
-        print("   • Run with --failfast to stop at first failure")
-        print("   • Run with --file <test_file> to test specific modules")
-        print("   • Run with --pattern <pattern> to match test names")
+        emit([
+            "",
+            "=" * 70,
+            f"{icon('❌')}Some tests failed!",
+            "=" * 70,
+            "",
+            f"{icon('💡')}Tips:",
+            "   • Run with --verbose for detailed output",
+            "   • Run with --failfast to stop at first failure",
+            "   • Run with --file <test_file> to test specific modules",
+            "   • Run with --pattern <pattern> to match test names",
+            "   • Re-run only failures: python uv_test.py --lf -x"
+            + ("" if args.cached else " (record them first with --cached)"),
+        ])
         sys.exit(1)
 
 
+# Test modules covering each app. accounts and tenants back every test through
+# the shared fixtures, so they (like any unlisted app) run the full suite.
+_APP_TEST_MODULES = {
+    "boards": ("test_boards_models.py",),
+    "invoices": ("test_invoices_pdf_templates.py", "test_web_views.py"),
+    "projects": (
+        "test_api.py",
+        "test_automation.py",
+        "test_integration.py",
+        "test_projects_models.py",
+        "test_web_views.py",
+    ),
+    "web": ("test_integration.py", "test_web_views.py"),
+}
+
+
+def changed_test_paths(base):
+    """Test files covering the Python files changed since ``base``.
+
+    ``apps/<app>/...`` maps through ``_APP_TEST_MODULES``; changed test modules
+    are run as they are. Returns None (run everything) when git fails, when
+    nothing changed, or when a change cannot be mapped, e.g. conftest.py,
+    config/ or an app missing from the map.
+    """
+    import subprocess
+
+    backend_dir = Path(_BACKEND_DIR)
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", base, "--", "*.py"],
+            cwd=backend_dir, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    paths = set()
+    for name in result.stdout.splitlines():
+        parts = Path(name).parts
+        if parts[0] == "tests" and len(parts) == 2 and parts[1].startswith("test_"):
+            if (backend_dir / name).exists():
+                paths.add(name)
+        elif parts[0] == "apps" and len(parts) > 2:
+            modules = _APP_TEST_MODULES.get(parts[1])
+            if modules is None:
+                return None
+            paths.update(f"tests/{module}" for module in modules)
+        else:
+            return None
+    return sorted(paths) or None
+
+
+@lru_cache(maxsize=1)
 def get_uv_version():
-    """Get UV version."""
+    """Get UV version (looked up once per process)."""
+    import subprocess
+
     try:
         result = subprocess.run(["uv", "--version"], capture_output=True, text=True)
         return result.stdout.strip()
@@ -139,23 +305,17 @@ def get_uv_version():
 
 
 if __name__ == "__main__":
-    # Show help if no arguments
+    # Show help if no arguments; the option list comes from the parser itself
     if len(sys.argv) == 1:
-        print("🧪 UV Test Runner for Project Manager Backend")
-        print("\n🚀 Quick start:")
-        print("   python uv_test.py                    # Run all tests")
-        print("   python uv_test.py --coverage         # With coverage")
-        print("   python uv_test.py --coverage --html  # HTML coverage report")
-        print("   python uv_test.py -f test_automation.py  # Specific file")
-        print("   python uv_test.py -m automation      # Automation tests only")
-        print("   python uv_test.py -v                 # Verbose output")
-        print("   python uv_test.py -x                 # Stop on first failure")
-        print("   python uv_test.py -n 4               # Run in parallel")
-        print("\n📚 Setup:")
-        print("   uv venv")
-        print("   source .venv/bin/activate")
-        print("   uv sync --dev")
-        print("\nFor more options: python uv_test.py --help")
+        emit([f"{icon('🧪')}UV Test Runner for Project Manager Backend", ""])
+        _build_parser().print_help(sys.stdout)
+        emit([
+            "",
+            f"{icon('📚')}Setup:",
+            "   uv venv",
+            "   source .venv/bin/activate",
+            "   uv sync --dev",
+        ])
         sys.exit(0)
     
-    main()
\ No newline at end of file
+    main()